@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Startup and dispatch cost of the argparse, click, typer, docopt and fire CLIs.
+
+For each example under `src/cli-*` this measures, over repeated trials:
+
+- cold start: wall time of `python app.py <cheap command>` in a new process
+  (what a cron job pays per invocation), next to a bare `python -c pass`;
+- peak RSS of that process (from `wait4`, Unix only);
+- import time of the `app` module (`-X importtime`, see import_time.py);
+- dispatch: in-process time to parse argv and run the command once the
+  module is imported, i.e. the framework's per-call overhead.
+
+Commands are chosen to do almost no work of their own (`run --limit 1`,
+`add 2 3`, ...), so the numbers are dominated by the framework.
+
+Usage:
+  python benchmarks/cli_frameworks.py
+  python benchmarks/cli_frameworks.py --trials 30 --calls 2000 --json > report.json
+  python benchmarks/cli_frameworks.py --only click,typer
+"""
+import argparse, json, os, platform, statistics, subprocess, sys, time
+
+from import_time import SRC, app_import_ms
+
+# name -> (example directory, argv, entry point evaluated inside the app's process)
+CLIS = {
+    "argparse": ("cli-argparse", ["run", "--limit", "1"], "app.main()"),
+    "click": ("cli-click", ["run", "--limit", "1"], "app.cli.main(standalone_mode=False)"),
+    "typer": ("cli-typer", ["run", "--limit", "1", "--delay", "0"], "app.app(standalone_mode=False)"),
+    "docopt": ("cli-docopt", ["run", "--fast", "--times=0"], "app.main()"),
+    "fire": ("cli-fire", ["add", "2", "3"], "app.fire.Fire(app.Tools)"),
+}
+
+# Runs in the example directory: imports the app, then times `calls` dispatches
+# with stdout sent to /dev/null and prints the per-call seconds as JSON
+DISPATCH = """
+import contextlib, json, os, sys, time
+import app
+sys.argv = ["app.py", *{argv!r}]
+def call():
+    try:
+        {entry}
+    except SystemExit:
+        pass
+samples = []
+with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+    for _ in range({warmup}):
+        call()
+    for _ in range({calls}):
+        t0 = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - t0)
+print(json.dumps(samples))
+"""
+
+
+def summarize(samples, scale: float = 1.0) -> dict:
+    values = sorted(v * scale for v in samples)
+    return {
+        "n": len(values),
+        "mean": round(statistics.fmean(values), 3),
+        "median": round(statistics.median(values), 3),
+        "stdev": round(statistics.stdev(values), 3) if len(values) > 1 else 0.0,
+        "min": round(values[0], 3),
+        "p95": round(values[min(len(values) - 1, round(0.95 * (len(values) - 1)))], 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def cold_start(cmd, cwd) -> tuple:
+    """Wall seconds and peak RSS in MB (None off Unix) of one process."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        secs = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        rss = usage.ru_maxrss / (1 << 20 if sys.platform == "darwin" else 1 << 10)
+    else:
+        proc.wait()
+        secs, rss = time.perf_counter() - start, None
+    err = proc.stderr.read().decode()
+    proc.stderr.close()
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)}: exit {proc.returncode}\n{err[-2000:]}")
+    return secs, rss
+
+
+def dispatch(example: str, argv, entry: str, calls: int, warmup: int):
+    code = DISPATCH.format(argv=argv, entry=entry, calls=calls, warmup=warmup)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=SRC / example, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{example}: dispatch failed\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(name: str, trials: int, calls: int, warmup: int) -> dict:
+    example, argv, entry = CLIS[name]
+    cwd = SRC / example
+    starts = [cold_start([sys.executable, "app.py", *argv], cwd) for _ in range(trials)]
+    rss = [r for _, r in starts if r is not None]
+    return {
+        "cli": name,
+        "argv": argv,
+        "cold_start_ms": summarize([s for s, _ in starts], 1e3),
+        "peak_rss_mb": summarize(rss) if rss else None,
+        "import_ms": summarize([app_import_ms(example) for _ in range(trials)]),
+        "dispatch_us": summarize(dispatch(example, argv, entry, calls, warmup), 1e6),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=10, help="Process launches / import runs per CLI")
+    parser.add_argument("--calls", type=int, default=500, help="In-process dispatches per CLI")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed dispatches before measuring")
+    parser.add_argument("--only", default="", help="Comma-separated subset of: " + ", ".join(CLIS))
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report")
+    args = parser.parse_args()
+
+    names = [c for c in args.only.split(",") if c] or list(CLIS)
+    unknown = set(names) - set(CLIS)
+    if unknown:
+        parser.error(f"unknown CLI(s): {', '.join(sorted(unknown))}")
+
+    baseline = [cold_start([sys.executable, "-c", "pass"], SRC) for _ in range(args.trials)]
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "trials": args.trials,
+        "calls": args.calls,
+        "baseline": {
+            "cold_start_ms": summarize([s for s, _ in baseline], 1e3),
+            "peak_rss_mb": summarize([r for _, r in baseline]) if baseline[0][1] is not None else None,
+        },
+        "results": [measure(name, args.trials, args.calls, args.warmup) for name in names],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    base = report["baseline"]
+    print(f"Python {report['python']}, {args.trials} trials, {args.calls} dispatches; medians (p95)")
+    print(f"{'cli':<9} {'cold start ms':>18} {'import ms':>16} {'dispatch us':>18} {'peak RSS MB':>12}")
+    rss = f"{base['peak_rss_mb']['median']:12.1f}" if base["peak_rss_mb"] else f"{'-':>12}"
+    print(f"{'(python)':<9} {base['cold_start_ms']['median']:8.1f} ({base['cold_start_ms']['p95']:7.1f})"
+          f" {'-':>16} {'-':>18} {rss}")
+    for r in report["results"]:
+        rss = f"{r['peak_rss_mb']['median']:12.1f}" if r["peak_rss_mb"] else f"{'-':>12}"
+        print(f"{r['cli']:<9} {r['cold_start_ms']['median']:8.1f} ({r['cold_start_ms']['p95']:7.1f})"
+              f" {r['import_ms']['median']:6.1f} ({r['import_ms']['p95']:6.1f})"
+              f" {r['dispatch_us']['median']:8.1f} ({r['dispatch_us']['p95']:7.1f}) {rss}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
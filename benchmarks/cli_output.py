@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Bulk output speed of the argparse, click and typer `run` commands.
+
+Runs `run --limit N` of each CLI with per-item printing and with `--buffered`,
+redirecting stdout to a file (or /dev/null), and reports wall time, lines/s
+and MB/s. The output file is checked for the expected line count so a
+truncated run cannot look fast.
+
+Usage:
+  python benchmarks/cli_output.py
+  python benchmarks/cli_output.py --limit 1000000 --runs 3 --json
+  python benchmarks/cli_output.py --only typer --sink /dev/null
+"""
+import argparse, json, os, statistics, subprocess, sys, tempfile, time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Example directory and extra arguments for its `run` command
+CLIS = {
+    "argparse": ("cli-argparse", []),
+    "click": ("cli-click", []),
+    "typer": ("cli-typer", ["--delay", "0"]),
+}
+
+
+def run_once(name: str, limit: int, buffered: bool, sink: str) -> tuple:
+    """Run one CLI; returns (seconds, bytes written, line count or None)."""
+    example, extra = CLIS[name]
+    cmd = [sys.executable, "app.py", "run", "--limit", str(limit), *extra]
+    if buffered:
+        cmd.append("--buffered")
+    with open(sink, "wb") as out:
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=SRC / example, stdout=out, stderr=subprocess.PIPE)
+        secs = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name}: exit {proc.returncode}\n{proc.stderr.decode()[-2000:]}")
+    if sink == os.devnull:
+        return secs, None, None
+    size = os.path.getsize(sink)
+    with open(sink, "rb") as fh:
+        lines = sum(chunk.count(b"\n") for chunk in iter(lambda: fh.read(1 << 20), b""))
+    return secs, size, lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=lambda s: int(s.replace("_", "")), default=10_000_000,
+                        help="Items per run (default 10_000_000)")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per case (median is used)")
+    parser.add_argument("--only", default="", help="Comma-separated subset of: " + ", ".join(CLIS))
+    parser.add_argument("--sink", default=None, help="Output path (default: a temp file; /dev/null skips checks)")
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report")
+    args = parser.parse_args()
+
+    names = [c for c in args.only.split(",") if c] or list(CLIS)
+    unknown = set(names) - set(CLIS)
+    if unknown:
+        parser.error(f"unknown CLI(s): {', '.join(sorted(unknown))}")
+
+    tmp = None
+    sink = args.sink
+    if sink is None:
+        fd, tmp = tempfile.mkstemp(prefix="cli_output_", suffix=".txt")
+        os.close(fd)
+        sink = tmp
+
+    report = []
+    try:
+        for name in names:
+            for buffered in (False, True):
+                samples = [run_once(name, args.limit, buffered, sink) for _ in range(args.runs)]
+                secs = statistics.median(s[0] for s in samples)
+                size, lines = samples[-1][1], samples[-1][2]
+                if lines is not None and lines != args.limit:
+                    raise RuntimeError(f"{name}: expected {args.limit} lines, got {lines}")
+                report.append({
+                    "cli": name,
+                    "mode": "buffered" if buffered else "per-item",
+                    "seconds": round(secs, 3),
+                    "lines_per_s": round(args.limit / secs),
+                    "mb_per_s": round(size / 1e6 / secs, 1) if size is not None else None,
+                })
+    finally:
+        if tmp:
+            os.unlink(tmp)
+
+    if args.json:
+        print(json.dumps({"limit": args.limit, "results": report}, indent=2))
+    else:
+        print(f"run --limit {args.limit:,} -> {args.sink or 'temp file'}")
+        per_item = {r["cli"]: r["seconds"] for r in report if r["mode"] == "per-item"}
+        for r in report:
+            speedup = per_item[r["cli"]] / r["seconds"]
+            mb = f"{r['mb_per_s']:7.1f} MB/s" if r["mb_per_s"] is not None else ""
+            print(f"{r['cli']:<9} {r['mode']:<9} {r['seconds']:8.2f}s {r['lines_per_s']:>12,} lines/s "
+                  f"{mb}  x{speedup:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Throughput of the Fire `Tools.add` CLI: one call per pair vs `add_batch`.
+
+Generates N random integer pairs, then measures:
+
+- process: `python app.py add A B`, one interpreter launch per pair (timed on
+  a small sample and extrapolated to N);
+- dispatch: `fire.Fire(Tools, command=["add", A, B])` in one process, i.e.
+  Fire's per-call parsing without the launch (also sampled);
+- batch: `python app.py add_batch pairs.txt` over all N pairs, checked
+  against the expected sums.
+
+Usage:
+  python benchmarks/fire_batch.py
+  python benchmarks/fire_batch.py --pairs 1000000 --sample 50 --json
+"""
+import argparse, json, os, random, statistics, subprocess, sys, tempfile, time
+
+from import_time import SRC
+
+APP_DIR = SRC / "cli-fire"
+
+DISPATCH = """
+import contextlib, io, json, time, fire, app
+pairs = {pairs!r}
+with contextlib.redirect_stdout(io.StringIO()):
+    t0 = time.perf_counter()
+    for a, b in pairs:
+        fire.Fire(app.Tools, command=["add", str(a), str(b)])
+    secs = time.perf_counter() - t0
+print(json.dumps(secs))
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=lambda s: int(s.replace("_", "")), default=1_000_000,
+                        help="Pairs processed by add_batch (default 1_000_000)")
+    parser.add_argument("--sample", type=int, default=20, help="Process launches timed for the per-call case")
+    parser.add_argument("--dispatch-sample", type=int, default=2000, help="In-process Fire calls timed")
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pairs = [(rng.randint(-10**6, 10**6), rng.randint(-10**6, 10**6)) for _ in range(args.pairs)]
+    fd, src = tempfile.mkstemp(prefix="pairs_", suffix=".txt")
+    out = src + ".sums"
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write("".join(f"{a} {b}\n" for a, b in pairs))
+
+        launches = []
+        for a, b in pairs[:args.sample]:
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, "app.py", "add", str(a), str(b)], cwd=APP_DIR,
+                           check=True, stdout=subprocess.DEVNULL)
+            launches.append(time.perf_counter() - t0)
+        per_launch = statistics.median(launches)
+
+        code = DISPATCH.format(pairs=pairs[:args.dispatch_sample])
+        proc = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, check=True,
+                              capture_output=True, text=True)
+        per_dispatch = json.loads(proc.stdout) / min(args.dispatch_sample, len(pairs))
+
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "app.py", "add_batch", src, "--output", out], cwd=APP_DIR, check=True)
+        batch_secs = time.perf_counter() - t0
+        with open(out) as fh:
+            sums = [int(line) for line in fh]
+        if sums != [a + b for a, b in pairs]:
+            raise RuntimeError("add_batch output does not match the expected sums")
+    finally:
+        for path in (src, out):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    report = [
+        {"mode": "process", "pairs_per_s": round(1 / per_launch, 1),
+         "seconds_for_all": round(per_launch * args.pairs, 1), "measured": "extrapolated"},
+        {"mode": "dispatch", "pairs_per_s": round(1 / per_dispatch, 1),
+         "seconds_for_all": round(per_dispatch * args.pairs, 1), "measured": "extrapolated"},
+        {"mode": "batch", "pairs_per_s": round(args.pairs / batch_secs, 1),
+         "seconds_for_all": round(batch_secs, 3), "measured": "full run"},
+    ]
+    if args.json:
+        print(json.dumps({"pairs": args.pairs, "results": report}, indent=2))
+        return 0
+    print(f"{args.pairs:,} pairs")
+    for r in report:
+        speedup = r["pairs_per_s"] / report[0]["pairs_per_s"]
+        print(f"{r['mode']:<9} {r['pairs_per_s']:>14,.0f} pairs/s {r['seconds_for_all']:>12,.1f}s for all"
+              f" ({r['measured']})  x{speedup:,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
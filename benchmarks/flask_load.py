@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Load test for the Flask demo: requests/second and p50/p99 latency per route.
+
+Start the app first, e.g. with the production config:
+  cd src/flask-app && gunicorn -c gunicorn.conf.py app:app
+
+Then run:
+  python benchmarks/flask_load.py --url http://127.0.0.1:8000 --requests 2000 --concurrency 16
+
+`/submit` posts a form (each request stores a profile) and `/welcome` reads
+the profiles created by it. Redirects are not followed. Only the standard
+library is used, with one keep-alive connection per client thread.
+"""
+import argparse, http.client, json, statistics, sys, threading, time
+from urllib.parse import urlencode, urlsplit
+
+FORM = urlencode({"name": "Load Test", "email": "load@example.com", "role": "Engineer",
+                  "bio": "benchmark", "subscribe": "on"})
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float("nan")
+    k = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[k]
+
+
+def run_route(host, port, make_request, total, concurrency):
+    """Issue ``total`` requests from ``concurrency`` threads; return stats."""
+    latencies, errors, lock = [], [0], threading.Lock()
+    counter = iter(range(total))
+
+    def worker():
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local = []
+        for i in counter:
+            method, path, body, headers = make_request(i)
+            t0 = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                ok = resp.status < 400
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                ok = False
+            local.append(time.perf_counter() - t0)
+            if not ok:
+                with lock:
+                    errors[0] += 1
+        with lock:
+            latencies.extend(local)
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the running app")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client threads")
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+
+    # One profile to read back from /welcome
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        conn.request("POST", "/submit", body=FORM, headers={"Content-Type": "application/x-www-form-urlencoded"})
+        resp = conn.getresponse()
+        resp.read()
+    except OSError as e:
+        print(f"Cannot reach {args.url}: {e}", file=sys.stderr)
+        return 2
+    welcome = resp.getheader("Location", "/welcome")
+    welcome = urlsplit(welcome)._replace(scheme="", netloc="").geturl()
+    conn.close()
+
+    routes = {
+        "GET /": lambda i: ("GET", "/", None, {}),
+        "POST /submit": lambda i: ("POST", "/submit", FORM, {"Content-Type": "application/x-www-form-urlencoded"}),
+        "GET /welcome": lambda i: ("GET", welcome, None, {}),
+    }
+    report = {name: run_route(host, port, make, args.requests, args.concurrency) for name, make in routes.items()}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'route':<14} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for name, r in report.items():
+            print(f"{name:<14} {r['rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['errors']:>7}")
+    return 1 if any(r["errors"] for r in report.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
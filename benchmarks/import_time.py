@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Import-time budget check for the CLI examples.
+
+Runs `python -X importtime -c "import app"` inside each example directory,
+takes the median cumulative import time of the `app` module over several
+runs, and exits with status 1 if any example exceeds its budget. Import time
+is what lazy imports save, and it is paid on every invocation, `--help`
+included.
+
+Usage:
+  python benchmarks/import_time.py
+  python benchmarks/import_time.py --runs 9 --json
+  python benchmarks/import_time.py --budget cli-typer-rich=120
+"""
+import argparse, json, re, statistics, subprocess, sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Milliseconds; generous enough for slower machines, tight enough to catch an
+# eager import of pandas or Rich's progress/table modules
+BUDGETS_MS = {
+    "cli-typer": 80,
+    "cli-typer-rich": 90,
+    "rich-demo": 90,
+}
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def app_import_ms(example: str) -> float:
+    """Cumulative import time of the example's top-level `app` module, in ms."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=SRC / example, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{example}: import failed\n{proc.stderr[-2000:]}")
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if m and not m.group(3) and m.group(4) == "app":
+            return int(m.group(2)) / 1000.0
+    raise RuntimeError(f"{example}: no importtime line for 'app'")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per example (median is used)")
+    parser.add_argument("--budget", action="append", default=[], metavar="NAME=MS",
+                        help="Override a budget, e.g. rich-demo=150 (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report")
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS_MS)
+    for item in args.budget:
+        name, _, ms = item.partition("=")
+        budgets[name] = float(ms)
+
+    report = []
+    for example, budget in budgets.items():
+        samples = [app_import_ms(example) for _ in range(args.runs)]
+        median = statistics.median(samples)
+        report.append({
+            "example": example,
+            "median_ms": round(median, 2),
+            "min_ms": round(min(samples), 2),
+            "budget_ms": budget,
+            "ok": median <= budget,
+        })
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for r in report:
+            status = "ok" if r["ok"] else "OVER BUDGET"
+            print(f"{r['example']:<16} median={r['median_ms']:7.1f}ms min={r['min_ms']:7.1f}ms "
+                  f"budget={r['budget_ms']:.0f}ms  {status}")
+    return 0 if all(r["ok"] for r in report) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Offline check of the price cache in `tester.py`.
+
+Drives `PriceCache` with a stub fetcher instead of Yahoo and checks the
+paths a real session takes: the cold fill, a warm hit, tail and head
+fetches (each re-fetching one cached bar), a rebuild when the re-fetched bar
+was back-adjusted, a corrupt pickle treated as a miss, and TTL and LRU
+eviction. Prints what each step fetched and how long it took; exits with
+status 1 if any check fails.
+
+The stub's close for a date depends only on that date (and the current
+adjustment), like Yahoo's. A stand-in whose prices depend on the requested
+start would make every overlapping bar disagree and force a full rebuild on
+each incremental fetch.
+
+Usage:
+  python benchmarks/price_cache.py
+  python benchmarks/price_cache.py --years 20
+"""
+import argparse, os, sys, tempfile, time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from tester import PriceCache, RunningStats, close_series  # noqa: E402
+
+TODAY = date(2024, 6, 28)
+
+
+class StubFetcher:
+    """Deterministic business-day bars that record every requested range.
+
+    ``adjust(before, factor)`` scales all closes before a date, as a
+    dividend adjustment rewrites history on Yahoo.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.adjustments = []
+
+    def adjust(self, before, factor):
+        self.adjustments.append((pd.Timestamp(before), factor))
+
+    def __call__(self, ticker, start, end, interval, adjust):
+        self.calls.append((start, end))
+        idx = pd.bdate_range(start, end - timedelta(days=1), name="Date")
+        close = 100 + (idx.to_julian_date().to_numpy() % 1000) / 10
+        for before, factor in self.adjustments:
+            close = np.where(idx < before, close * factor, close)
+        return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close,
+                             "Volume": 1_000}, index=idx)
+
+    def take_calls(self):
+        calls, self.calls = self.calls, []
+        return calls
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=5, help="History length of the cold fill")
+    args = parser.parse_args()
+
+    fetcher = StubFetcher()
+    failures = []
+
+    def check(name, ok, detail=""):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}{': ' + detail if detail else ''}")
+        if not ok:
+            failures.append(name)
+
+    def timed(cache, start, end, ticker="AAA"):
+        t0 = time.perf_counter()
+        bars = cache.get(ticker, start, end, today=TODAY)
+        return bars, (time.perf_counter() - t0) * 1000
+
+    with tempfile.TemporaryDirectory() as root:
+        cache = PriceCache(root, fetcher=fetcher)
+        start = date(TODAY.year - args.years, 1, 1)
+        mid = date(TODAY.year, 3, 1)
+
+        bars, ms = timed(cache, start, mid)
+        calls = fetcher.take_calls()
+        check("cold fill fetches the whole range", calls == [(start, mid)], f"{len(bars)} bars, {ms:.1f}ms")
+
+        bars, ms = timed(cache, start, mid)
+        calls = fetcher.take_calls()
+        check("warm hit fetches nothing", calls == [], f"{len(bars)} bars, {ms:.1f}ms")
+
+        last = bars.index[-1].date()
+        tail_end = date(TODAY.year, 5, 1)
+        bars, ms = timed(cache, start, tail_end)
+        calls = fetcher.take_calls()
+        check("tail fetch starts at the last cached bar", calls == [(last, tail_end)], f"{calls}, {ms:.1f}ms")
+        full = RunningStats().update(close_series(bars), before=TODAY)
+        stored = cache.stats("AAA")
+        check("tail fetch extends the stored stats",
+              stored.count == full.count and np.isclose(stored.mean, full.mean), f"count={stored.count}")
+
+        first = bars.index[0].date()
+        head_start = start - timedelta(days=60)
+        bars, ms = timed(cache, head_start, tail_end)
+        calls = fetcher.take_calls()
+        check("head fetch ends after the first cached bar",
+              calls == [(head_start, first + timedelta(days=1))], f"{calls}, {ms:.1f}ms")
+
+        # A dividend after the cached range scales every earlier close
+        fetcher.adjust(date(TODAY.year, 5, 15), 0.99)
+        bars, ms = timed(cache, head_start, TODAY)
+        calls = fetcher.take_calls()
+        expected = fetcher("AAA", head_start, TODAY, "1d", True)
+        fetcher.take_calls()
+        check("a back-adjusted bar rebuilds the entry",
+              len(calls) == 2 and calls[1] == (head_start, TODAY)
+              and np.allclose(close_series(bars).to_numpy(), expected["Close"].to_numpy()),
+              f"{calls}, {ms:.1f}ms")
+
+        data_path, _ = cache._paths(cache.key("AAA", "1d", True))
+        data_path.write_bytes(b"not a pickle")
+        bars, ms = timed(cache, head_start, mid)
+        calls = fetcher.take_calls()
+        check("a corrupt pickle is a miss", calls == [(head_start, mid)], f"{len(bars)} bars")
+
+        ttl = PriceCache(root, fetcher=fetcher, ttl=60)
+        removed = ttl.evict(now=time.time() + 120)
+        check("TTL evicts idle entries", len(removed) == 1 and not list(ttl.entries()))
+
+        lru = PriceCache(root, fetcher=fetcher)
+        lru.get("AAA", start, mid, today=TODAY)
+        size = next(m for _, m in lru.entries())["bytes"]
+        lru.max_bytes = int(size * 1.5)
+        time.sleep(0.01)
+        lru.get("BBB", start, mid, today=TODAY)
+        left = {m["ticker"] for _, m in lru.entries()}
+        fetcher.take_calls()
+        check("LRU evicts the least recently used entry", left == {"BBB"}, f"kept {sorted(left)}")
+
+    print(f"{len(failures)} failed" if failures else "all checks passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Per-iteration overhead of progress reporting versus a bare loop.
+
+Times a tight `for` loop of N steps with no progress, with tqdm and Rich
+updated on every step, and with `BatchedProgress` from `src/common` (enabled,
+rendering to /dev/null, and disabled as it is off-TTY). Reports nanoseconds
+per step and the overhead over the bare loop.
+
+Usage:
+  python benchmarks/progress_overhead.py
+  python benchmarks/progress_overhead.py --steps 10000000 --json
+  python benchmarks/progress_overhead.py --only bare,batched-update
+"""
+import argparse, json, os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src", "common"))
+from batched_progress import BatchedProgress  # noqa: E402
+
+
+def bare(n, sink):
+    for _ in range(n):
+        pass
+
+
+def tqdm_update(n, sink):
+    from tqdm import tqdm
+    with tqdm(total=n, file=sink, mininterval=0.1) as bar:
+        for _ in range(n):
+            bar.update(1)
+
+
+def tqdm_iter(n, sink):
+    from tqdm import tqdm
+    for _ in tqdm(range(n), file=sink, mininterval=0.1):
+        pass
+
+
+def rich_update(n, sink):
+    from rich.console import Console
+    from rich.progress import Progress
+    with Progress(console=Console(file=sink, force_terminal=True)) as progress:
+        task = progress.add_task("rich", total=n)
+        for _ in range(n):
+            progress.update(task, advance=1)
+
+
+def batched_update(n, sink):
+    with BatchedProgress(total=n, file=sink, disable=False) as bar:
+        for _ in range(n):
+            bar.update()
+
+
+def batched_track(n, sink):
+    with BatchedProgress(total=n, file=sink, disable=False) as bar:
+        for _ in bar.track(range(n)):
+            pass
+
+
+def batched_rich(n, sink):
+    from rich.console import Console
+    console = Console(file=sink, force_terminal=True)
+    with BatchedProgress(total=n, backend="rich", console=console, disable=False) as bar:
+        for _ in range(n):
+            bar.update()
+
+
+def batched_disabled(n, sink):
+    with BatchedProgress(total=n, file=sink, disable=True) as bar:
+        for _ in range(n):
+            bar.update()
+
+
+CASES = {
+    "bare": bare,
+    "tqdm-update": tqdm_update,
+    "tqdm-iter": tqdm_iter,
+    "rich-update": rich_update,
+    "batched-update": batched_update,
+    "batched-track": batched_track,
+    "batched-rich": batched_rich,
+    "batched-disabled": batched_disabled,
+}
+
+
+def time_case(fn, n: int, runs: int) -> float:
+    """Best wall time of `runs` runs, in seconds."""
+    best = float("inf")
+    with open(os.devnull, "w") as sink:
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn(n, sink)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=2_000_000, help="Loop iterations per case")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per case (best is used)")
+    parser.add_argument("--only", default="", help="Comma-separated subset of: " + ", ".join(CASES))
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report")
+    args = parser.parse_args()
+
+    names = [c for c in args.only.split(",") if c] or list(CASES)
+    unknown = set(names) - set(CASES)
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+    if "bare" not in names:
+        names.insert(0, "bare")
+
+    results = {name: time_case(CASES[name], args.steps, args.runs) for name in names}
+    base = results["bare"]
+    report = [{
+        "case": name,
+        "seconds": round(secs, 4),
+        "ns_per_step": round(secs / args.steps * 1e9, 1),
+        "overhead_ns_per_step": round((secs - base) / args.steps * 1e9, 1),
+        "slowdown": round(secs / base, 2) if base else None,
+    } for name, secs in results.items()]
+
+    if args.json:
+        print(json.dumps({"steps": args.steps, "results": report}, indent=2))
+    else:
+        print(f"{args.steps:,} steps, best of {args.runs}")
+        for r in report:
+            print(f"{r['case']:<17} {r['seconds']:8.3f}s {r['ns_per_step']:8.1f} ns/step "
+                  f"+{r['overhead_ns_per_step']:7.1f} ns  x{r['slowdown']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,9 +2,13 @@
 """Argparse CLI example with subcommands.
 Usage:
   python app.py run --limit 10
+  python app.py run --limit 10_000_000 --buffered > manifest.txt
   python app.py info --json
 """
-import argparse, json, sys
+import argparse, json, os, sys
+
+# Shared helpers from src/common, imported where they are used
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="argcli", description="Argparse demo")
@@ -12,14 +16,25 @@ def build_parser() -> argparse.ArgumentParser:
 
     p_run = sub.add_parser("run", help="Run a computation")
     p_run.add_argument("--limit", type=int, default=5, help="Number of items")
+    p_run.add_argument("--buffered", action="store_true",
+                       help="Write output in large blocks instead of one print per item")
 
     p_info = sub.add_parser("info", help="Show info")
     p_info.add_argument("--json", action="store_true", help="Output JSON")
     return parser
 
-def cmd_run(limit: int) -> int:
-    for i in range(limit):
-        print(f"processing {i}")
+def cmd_run(limit: int, buffered: bool = False) -> int:
+    from bulk_output import silence_broken_pipe, write_lines
+
+    # A closed pipe (`| head`) ends the command quietly with status 1
+    with silence_broken_pipe():
+        if buffered:
+            sys.stdout.flush()
+            write_lines("processing ", limit, sys.stdout.buffer)
+        else:
+            for i in range(limit):
+                print(f"processing {i}")
+            sys.stdout.flush()
     return 0
 
 def cmd_info(as_json: bool) -> int:
@@ -33,7 +48,7 @@ def cmd_info(as_json: bool) -> int:
 def main() -> int:
     args = build_parser().parse_args()
     if args.cmd == "run":
-        return cmd_run(args.limit)
+        return cmd_run(args.limit, args.buffered)
     if args.cmd == "info":
         return cmd_info(args.json)
     return 2
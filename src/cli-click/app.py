@@ -1,26 +1,50 @@
 #!/usr/bin/env python3
-import os, click
+import os, sys, click
+
+# Shared helpers from src/common, imported where they are used
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+
+def profile_command(ctx, mode, output):
+    """Profile the rest of this invocation (see src/common/cli_profiling.py)."""
+    from cli_profiling import profiled
+
+    ctx.with_resource(profiled(mode, output))
 
 @click.group()
 @click.version_option("0.1.0")
 @click.option("--verbose", "-v", count=True, help="Increase verbosity")
+@click.option("--profile", type=click.Choice(["cpu", "mem", "all"]),
+              help="Report hot functions (cpu), peak allocation sites (mem) or both for the command")
+@click.option("--profile-output", type=click.Path(dir_okay=False),
+              help="Write the profile report here instead of stderr (.prof: raw cProfile data)")
 @click.pass_context
-def cli(ctx, verbose):
+def cli(ctx, verbose, profile, profile_output):
     ctx.obj = {"verbose": verbose, "api_key": os.getenv("DEMO_API_KEY", "")}
+    if profile:
+        profile_command(ctx, profile, profile_output)
 
 # The 'run' command prints a numbered list up to the specified limit.
 # If verbosity is enabled, it shows the API key status before printing.
+# --buffered writes the list in large blocks, which matters for big limits.
 @cli.command()
 @click.option("--limit", default=5, show_default=True, type=int)
+@click.option("--buffered", is_flag=True, help="Write output in large blocks instead of one echo per item")
 @click.option("--verbose", "-v", count=True, help="Increase verbosity")
 @click.pass_context
-def run(ctx, limit, verbose):
+def run(ctx, limit, buffered, verbose):
     # Support -v at both group and command level; combine them
     eff_v = (ctx.obj.get("verbose", 0) or 0) + (verbose or 0)
     if eff_v:
         click.echo(f"[v{eff_v}] api_key set? {bool(ctx.obj['api_key'])}")
-    for i in range(limit):
-        click.echo(f"click: {i}")
+    from bulk_output import silence_broken_pipe, write_lines
+
+    # A closed pipe (`| head`) ends the command quietly with status 1
+    with silence_broken_pipe():
+        if buffered:
+            write_lines("click: ", limit, sys.stdout.buffer)
+        else:
+            for i in range(limit):
+                click.echo(f"click: {i}")
 
 # The 'greet' command prompts the user for their name and prints a greeting in green and bold.
 @cli.command()
@@ -3,7 +3,8 @@
 Demo CLI using docopt that contrasts a "normal" path with a "fast" path.
 
 Usage:
-  app.py run [--fast] [--times=N]
+  app.py run [--fast] [--times=N] [--async] [--concurrency=N] [--compare]
+  app.py bench [--times=N] [--size=BYTES] [--workers=N] [--processes] [--algo=NAME] [--chunk=BYTES] [--quiet] [FILE...]
   app.py (-h | --help)
   app.py --version
 
@@ -14,36 +15,224 @@ Options:
                   to minimize latency (useful for demos). Output is illustrative
                   and may differ from normal mode.
   --times=N       Number of iterations to run [default: 3].
+  --async         Overlap the simulated waits with asyncio; output stays in
+                  iteration order.
+  --concurrency=N
+                  Maximum iterations in flight with --async [default: 4].
+  --compare       Time serial and --async runs and report the speedup.
+  --size=BYTES    Generated buffer size for bench, e.g. 64K, 8M, 1G [default: 8M].
+  --workers=N     Concurrent hashing workers for bench [default: 1].
+  --processes     Use a process pool instead of threads (threads already run
+                  in parallel because hashlib releases the GIL).
+  --algo=NAME     hashlib algorithm for bench [default: sha256].
+  --chunk=BYTES   Read size when streaming FILEs [default: 1M].
+  --quiet         Only print the bench summary.
 
 Details:
   Normal mode simulates a heavier task by hashing a larger payload and adding a
   longer sleep per iteration to mimic I/O or network latency.
   Fast mode uses a smaller payload and a shorter sleep to finish faster.
+  With --async the waits overlap, so the total drops from times * delay to
+  roughly times / concurrency * delay.
+
+  bench is an honest throughput benchmark: without FILEs it hashes one
+  preallocated buffer of --size bytes --times times; with FILEs it streams each
+  file (--times passes) through a reused --chunk buffer. The work is spread
+  over a pool of --workers and MB/s plus per-iteration latency are reported.
 """
-from docopt import docopt
+from collections import deque
+from docopt import DocoptExit, docopt
 from hashlib import sha256
+import hashlib
+import os
+import statistics
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 VERSION = "1.0.0"
 
+# Fixed-length digests only (shake_* need an explicit output length)
+ALGORITHMS = sorted(a for a in hashlib.algorithms_guaranteed if not a.startswith("shake"))
+UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+# Buffer hashed in generated mode; one per process, shared by its threads
+_BUFFER = None
+# Per-thread read buffer reused for every file chunk
+_local = threading.local()
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in UNITS else ""
+    return int(float(text[: len(text) - len(unit)]) * UNITS[unit])
+
+
+def _positive(args, option: str, parse=int) -> int:
+    """Parse an option that must be >= 1, or exit with the usage text."""
+    try:
+        value = parse(args[option])
+    except ValueError:
+        raise DocoptExit(f"{option} must be a number, got {args[option]!r}") from None
+    if value < 1:
+        raise DocoptExit(f"{option} must be at least 1, got {args[option]!r}")
+    return value
+
+
+def _ready() -> None:
+    """No-op task used to start pool workers before timing."""
+
+
+def _init_buffer(size: int) -> None:
+    global _BUFFER
+    _BUFFER = memoryview(os.urandom(size))
+
+
+def hash_generated(algo: str):
+    """Hash the preallocated buffer; returns (digest, bytes, seconds)."""
+    t0 = time.perf_counter()
+    digest = hashlib.new(algo, _BUFFER).hexdigest()
+    return digest, len(_BUFFER), time.perf_counter() - t0
+
+
+def hash_file(path: str, algo: str, chunk: int):
+    """Stream a file through a reused buffer; returns (digest, bytes, seconds)."""
+    buf = getattr(_local, "buf", None)
+    if buf is None or len(buf) != chunk:
+        buf = _local.buf = bytearray(chunk)
+    view = memoryview(buf)
+    h = hashlib.new(algo)
+    total = 0
+    t0 = time.perf_counter()
+    with open(path, "rb", buffering=0) as fh:
+        while n := fh.readinto(buf):
+            h.update(view[:n])
+            total += n
+    return h.hexdigest(), total, time.perf_counter() - t0
+
+
+def bench(args) -> None:
+    times = _positive(args, "--times")
+    workers = _positive(args, "--workers")
+    size = _positive(args, "--size", parse_size)
+    chunk = _positive(args, "--chunk", parse_size)
+    algo = args["--algo"]
+    files = args["FILE"]
+    if algo not in ALGORITHMS:
+        raise DocoptExit(f"Unknown --algo {algo!r}; choose from: {', '.join(ALGORITHMS)}")
+
+    pool_cls = ProcessPoolExecutor if args["--processes"] else ThreadPoolExecutor
+    if files:
+        pool = pool_cls(max_workers=workers)
+        tasks = [(f, hash_file, (f, algo, chunk)) for _ in range(times) for f in files]
+        label = f"{len(files)} file(s)"
+    else:
+        if args["--processes"]:
+            pool = pool_cls(max_workers=workers, initializer=_init_buffer, initargs=(size,))
+        else:
+            _init_buffer(size)
+            pool = pool_cls(max_workers=workers)
+        tasks = [(f"iter={i}", hash_generated, (algo,)) for i in range(times)]
+        label = f"buffer={size}B"
+
+    kind = "processes" if args["--processes"] else "threads"
+    print(f"[BENCH] algo={algo} workers={workers} ({kind}) {label} times={times}")
+    with pool:
+        if args["--processes"]:
+            # Start the workers (and allocate their buffers) before the clock starts
+            warm = time.perf_counter()
+            for f in [pool.submit(_ready) for _ in range(workers)]:
+                f.result()
+            print(f"warm-up={time.perf_counter() - warm:.3f}s (excluded)")
+        start = time.perf_counter()
+        futures = [pool.submit(fn, *fn_args) for _, fn, fn_args in tasks]
+        results = [f.result() for f in futures]
+        wall = time.perf_counter() - start
+
+    latencies = sorted(r[2] for r in results)
+    total = sum(r[1] for r in results)
+    if not args["--quiet"]:
+        for (name, _, _), (digest, nbytes, secs) in zip(tasks, results):
+            print(f"{name} digest={digest[:8]} bytes={nbytes} latency={secs * 1000:.2f}ms")
+    p99 = latencies[round(0.99 * (len(latencies) - 1))]
+    print(
+        f"total={total / 1e6:.1f}MB wall={wall:.3f}s throughput={total / 1e6 / wall:.1f}MB/s "
+        f"latency p50={statistics.median(latencies) * 1000:.2f}ms p99={p99 * 1000:.2f}ms"
+    )
+
+
+def workload(fast: bool):
+    """Payload size and simulated wait for a mode."""
+    return (1_000, 0.02) if fast else (8_000, 0.12)
+
+
+def compute_digest(i: int, fast: bool) -> str:
+    # Simulate different workloads by changing payload size and sleep.
+    payload_len, delay = workload(fast)
+    payload = ("x" * payload_len).encode()
+    digest = sha256(payload).hexdigest()[:8]
+    time.sleep(delay)
+    return digest
+
+
+async def compute_digest_async(i: int, fast: bool) -> str:
+    import asyncio
+
+    payload_len, delay = workload(fast)
+    digest = sha256(("x" * payload_len).encode()).hexdigest()[:8]
+    await asyncio.sleep(delay)
+    return digest
+
+
+async def run_async(times: int, fast: bool, concurrency: int, emit) -> None:
+    import asyncio
+
+    # Sliding window: at most `concurrency` pending, awaited in order
+    pending = deque()
+    for i in range(times):
+        if len(pending) >= concurrency:
+            j, task = pending.popleft()
+            emit(j, await task)
+        pending.append((i, asyncio.ensure_future(compute_digest_async(i, fast))))
+    while pending:
+        j, task = pending.popleft()
+        emit(j, await task)
+
+
+def execute(times: int, fast: bool, concurrency: int, emit) -> float:
+    """Run all iterations serially (concurrency=0) or with asyncio; returns wall seconds."""
+    if concurrency:
+        # asyncio is slow to import; only load it for --async/--compare, untimed
+        import asyncio
+    start = time.perf_counter()
+    if concurrency:
+        asyncio.run(run_async(times, fast, concurrency, emit))
+    else:
+        for i in range(times):
+            emit(i, compute_digest(i, fast))
+    return time.perf_counter() - start
+
+
 def main():
     args = docopt(__doc__, version=VERSION)
-    times = int(args["--times"]) if args["--times"] else 3
+    if args["bench"]:
+        return bench(args)
+    times = _positive(args, "--times")
     fast = bool(args["--fast"])  # True if --fast provided
+    concurrency = _positive(args, "--concurrency")
+    mode = "FAST" if fast else "NORMAL"
 
-    def compute_digest(i: int, fast: bool) -> str:
-        # Simulate different workloads by changing payload size and sleep.
-        payload_len = 1_000 if fast else 8_000
-        delay = 0.02 if fast else 0.12
-        payload = ("x" * payload_len).encode()
-        digest = sha256(payload).hexdigest()[:8]
-        time.sleep(delay)
-        return digest
+    if args["--compare"]:
+        serial = execute(times, fast, 0, lambda i, d: None)
+        overlapped = execute(times, fast, concurrency, lambda i, d: None)
+        print(f"[{mode}] times={times} serial={serial:.3f}s async(x{concurrency})={overlapped:.3f}s speedup={serial / overlapped:.1f}x")
+        return
 
-    for i in range(times):
-        digest = compute_digest(i, fast)
-        mode = "FAST" if fast else "NORMAL"
+    def emit(i: int, digest: str) -> None:
         print(f"[{mode}] iter={i} digest={digest} (payload={1000 if fast else 8000}B, delay={'20ms' if fast else '120ms'})")
 
+    execute(times, fast, concurrency if args["--async"] else 0, emit)
+
+
 if __name__ == "__main__":
     main()
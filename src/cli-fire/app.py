@@ -1,6 +1,113 @@
 #!/usr/bin/env python3
+import os
+import sys
+
 import fire
 
+# Shared helpers from src/common, imported where they are used
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+
+# Bytes read from the input per batch; blocks are cut at a newline
+CHUNK_BYTES = 1 << 22
+
+# Longest integer field that cannot overflow int64, even when two are added
+# (18 characters, sign included, stay below 10**18)
+MAX_INT_CHARS = 18
+
+# Bytes separating fields in add_batch input (the newline ends a record too)
+SEPARATORS = b" \t\r\n\v\f,"
+
+
+def _open_input(path):
+    if path in ("-", None):
+        return sys.stdin.buffer
+    # Fire parses a name like 123 as an int, which open() would take for an fd
+    path = str(path)
+    try:
+        return open(path, "rb")
+    except OSError as e:
+        raise fire.core.FireError(f"Cannot read {path}: {e.strerror}")
+
+
+def _read_blocks(path, chunk_bytes=CHUNK_BYTES):
+    """Yield blocks of whole lines (bytes) from a file or stdin ("-")."""
+    stream = _open_input(path)
+    try:
+        rest = b""
+        while True:
+            data = stream.read(chunk_bytes)
+            if not data:
+                break
+            data = rest + data
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                rest = data
+                continue
+            rest = data[cut:]
+            yield data[:cut]
+        if rest.strip():
+            yield rest + b"\n"
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+
+def _write_blocks(blocks, output):
+    """Write encoded blocks to a file or stdout ("-"), exiting quietly on a closed pipe.
+
+    A file is written under a temporary name and only renamed into place once
+    every block was produced, so bad input never leaves a partial file.
+    """
+    from bulk_output import silence_broken_pipe
+
+    if output in ("-", None):
+        with silence_broken_pipe():
+            for block in blocks:
+                sys.stdout.buffer.write(block)
+            sys.stdout.buffer.flush()
+        return
+    import tempfile
+
+    output = str(output)
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(output)}.", dir=os.path.dirname(output) or ".")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for block in blocks:
+                out.write(block)
+        os.replace(tmp, output)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _fields(block, np):
+    """Per-line field counts and the longest field of a block of whole lines."""
+    data = np.frombuffer(block, dtype=np.uint8)
+    sep = np.isin(data, np.frombuffer(SEPARATORS, dtype=np.uint8))
+    field = ~sep
+    starts = np.flatnonzero(field & np.concatenate(([True], sep[:-1])))
+    ends = np.flatnonzero(field & np.concatenate((sep[1:], [True])))
+    # Fields never contain a newline, so the inclusive count is the line index
+    line_of = np.cumsum(data == ord("\n"))
+    counts = np.bincount(line_of[starts], minlength=int(line_of[-1]) + 1)[:int(line_of[-1])]
+    longest = int((ends - starts).max()) + 1 if starts.size else 0
+    return counts, longest
+
+
+def _exact_sums(block, first_line):
+    """Add the pairs of a block with Python ints, for values beyond int64."""
+    text = block.decode().replace(",", " ")
+    sums = []
+    for n, line in enumerate(text.splitlines(), first_line):
+        if line.strip():
+            try:
+                a, b = map(int, line.split())
+            except ValueError:
+                raise fire.core.FireError(f"Line {n}: could not parse as int pair") from None
+            sums.append(a + b)
+    return sums
+
+
 class Tools:
     """Google Fire example: exposes methods as CLI commands"""
     def add(self, a: int, b: int) -> int:
@@ -10,5 +117,63 @@ class Tools:
     def greet(self, name: str = "World") -> str:
         return f"Hi {name}!"
 
+    def add_batch(self, path: str = "-", output: str = "-", dtype: str = "int"):
+        """Add many pairs in one process: one "a b" (or "a,b") pair per line.
+
+        Reads PATH (default stdin) in blocks, parses each block into a NumPy
+        array in one call, adds the columns and writes the sums in bulk to
+        OUTPUT (default stdout). Use --dtype=float for non-integer input.
+        Lines without exactly two numbers are rejected (blank lines are
+        skipped), and integers too large for int64 are added exactly.
+        """
+        import warnings
+
+        import numpy as np
+
+        kinds = {"int": np.int64, "float": np.float64}
+        if dtype not in kinds:
+            raise fire.core.FireError(f"--dtype must be one of: {', '.join(kinds)}")
+        kind = kinds[dtype]
+
+        def sums():
+            next_line = 1
+            for block in _read_blocks(path):
+                first_line, (counts, longest) = next_line, _fields(block, np)
+                next_line += counts.size
+                bad = np.flatnonzero((counts != 0) & (counts != 2))
+                if bad.size:
+                    n = int(bad[0])
+                    raise fire.core.FireError(
+                        f"Line {first_line + n}: expected two numbers, found {int(counts[n])}")
+                if not counts.any():
+                    continue
+                if kind is np.int64 and longest > MAX_INT_CHARS:
+                    # int64 could overflow; fall back to exact Python ints
+                    yield ("\n".join(map(str, _exact_sums(block, first_line))) + "\n").encode()
+                    continue
+                with warnings.catch_warnings():
+                    # Malformed text only warns by default; treat it as an error
+                    warnings.simplefilter("error")
+                    try:
+                        values = np.fromstring(block.replace(b",", b" "), dtype=kind, sep=" ")
+                    except (ValueError, DeprecationWarning):
+                        raise fire.core.FireError(f"Could not parse input as {dtype} pairs") from None
+                pairs = values.reshape(-1, 2)
+                total = pairs[:, 0] + pairs[:, 1]
+                yield ("\n".join(map(str, total.tolist())) + "\n").encode()
+
+        _write_blocks(sums(), output)
+
+    def greet_batch(self, path: str = "-", output: str = "-"):
+        """Greet every name in PATH (default stdin, one per line) with bulk writes."""
+        def greetings():
+            for block in _read_blocks(path):
+                names = [n for n in block.decode().splitlines() if n.strip()]
+                if names:
+                    yield ("Hi " + "!\nHi ".join(names) + "!\n").encode()
+
+        _write_blocks(greetings(), output)
+
+
 if __name__ == "__main__":
     fire.Fire(Tools)
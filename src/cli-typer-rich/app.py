@@ -1,16 +1,30 @@
 #!/usr/bin/env python3
-import csv, typer
-from rich.table import Table
-from rich.console import Console
-from rich.progress import track
+import bisect, csv, functools, hashlib, io, itertools, json, mmap, os, sys, typer
+from typing import Literal
+
+# Shared helpers from src/common, imported where they are used
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+
+# Rich and the process pool are imported inside the functions that use them,
+# so `--help` and light commands do not pay for loading them.
 
 app = typer.Typer()
-console = Console()
+_console = None
+_console_options = {}
+
+
+def get_console():
+    """Return the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console(**_console_options)
+    return _console
 
 def _debug(ctx: typer.Context, msg: str) -> None:
     v = (ctx.obj or {}).get("verbose", 0)
     if v:
-        console.print(f"[dim]v{v}[/] {msg}", highlight=False)
+        get_console().print(f"[dim]v{v}[/] {msg}", highlight=False)
 
 @app.callback()
 def main(
@@ -18,57 +32,459 @@ def main(
     verbose: int = typer.Option(0, "--verbose", "-v", count=True, help="Increase verbosity (repeatable)"),
     no_color: bool = typer.Option(False, "--no-color", help="Disable ANSI colors in output"),
     width: int = typer.Option(None, "--width", min=40, max=240, help="Override terminal width for rendering"),
+    profile: Literal["cpu", "mem", "all"] = typer.Option(None, "--profile", help="Report hot functions (cpu), peak allocation sites (mem) or both for the command"),
+    profile_output: str = typer.Option(None, "--profile-output", help="Write the profile report here instead of stderr (.prof: raw cProfile data)"),
 ):
     """Typer + Rich demo CLI (group).
 
     Sets global options for the whole app and configures Rich accordingly.
+    --profile wraps the subcommand in cProfile and/or tracemalloc.
     """
     ctx.ensure_object(dict)
     ctx.obj["verbose"] = verbose
 
     # Reconfigure the global Console with requested options
-    global console
-    console = Console(no_color=no_color, width=width)
+    global _console
+    _console = None
+    _console_options.update(no_color=no_color, width=width)
     _debug(ctx, f"Console configured (no_color={no_color}, width={width})")
+    if profile:
+        from cli_profiling import profiled
+
+        ctx.with_resource(profiled(profile, profile_output))
+
+# Sidecar index format version and row spacing of its byte-offset checkpoints
+INDEX_VERSION = 1
+CHECKPOINT_ROWS = 100_000
+
+NULL_TOKENS = {"", "na", "n/a", "nan", "null", "none"}
+
+
+class ColumnStats:
+    """Running statistics for one CSV column, built in a single pass.
+
+    Tracks null count, the narrowest type that fits every value
+    (int -> float -> str) and min/max. Instances can be merged, so chunks of
+    a file can be scanned independently.
+    """
+
+    __slots__ = ("count", "nulls", "kind", "num_min", "num_max", "text_min", "text_max")
+
+    def __init__(self):
+        self.count = 0
+        self.nulls = 0
+        self.kind = None
+        self.num_min = self.num_max = None
+        self.text_min = self.text_max = None
+
+    def add(self, value: str) -> None:
+        self.count += 1
+        if value.strip().lower() in NULL_TOKENS:
+            self.nulls += 1
+            return
+        if self.text_min is None or value < self.text_min:
+            self.text_min = value
+        if self.text_max is None or value > self.text_max:
+            self.text_max = value
+        if self.kind == "str":
+            return
+        try:
+            num = int(value) if self.kind in (None, "int") else float(value)
+            kind = self.kind or "int"
+        except ValueError:
+            try:
+                num, kind = float(value), "float"
+            except ValueError:
+                self.kind = "str"
+                return
+        self.kind = kind
+        if self.num_min is None or num < self.num_min:
+            self.num_min = num
+        if self.num_max is None or num > self.num_max:
+            self.num_max = num
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        order = [None, "int", "float", "str"]
+        self.count += other.count
+        self.nulls += other.nulls
+        self.kind = max(self.kind, other.kind, key=order.index)
+        for attr, pick in (("num_min", min), ("num_max", max), ("text_min", min), ("text_max", max)):
+            values = [v for v in (getattr(self, attr), getattr(other, attr)) if v is not None]
+            setattr(self, attr, pick(values) if values else None)
+        return self
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnStats":
+        col = cls()
+        for k in cls.__slots__:
+            setattr(col, k, data.get(k))
+        return col
+
+    @property
+    def type_name(self) -> str:
+        return self.kind or "empty"
+
+    @property
+    def bounds(self):
+        if self.kind in ("int", "float"):
+            return self.num_min, self.num_max
+        return self.text_min, self.text_max
+
+
+def count_lines(path: str, chunk_size: int = 1 << 20) -> int:
+    """Count data rows by counting newline bytes in large chunks.
+
+    Much faster than parsing, but assumes no quoted field contains a newline.
+    """
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as fh:
+        while chunk := fh.read(chunk_size):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        lines += 1  # final line without trailing newline
+    return max(lines - 1, 0)  # minus the header
+
+
+def scan_csv(path: str, delim: str, encoding: str = "utf-8", with_stats: bool = True, on_progress=None,
+             checkpoint_every: int = CHECKPOINT_ROWS):
+    """Stream a CSV once with constant memory.
+
+    Returns ``(header, first_row, n_rows, stats, checkpoints)`` where ``stats``
+    holds one ``ColumnStats`` per header column (empty if ``with_stats`` is
+    False) and ``checkpoints`` lists ``(row, byte_offset)`` every
+    ``checkpoint_every`` rows. ``on_progress(bytes_read)`` is called every few
+    thousand rows.
+    """
+    pos = 0
+
+    def lines(raw):
+        # csv.reader pulls one line at a time, so after each row ``pos`` is
+        # exactly where the next row starts (quoted newlines included)
+        nonlocal pos
+        for line in raw:
+            pos += len(line)
+            yield line.decode(encoding)
+
+    with open(path, "rb") as raw:
+        reader = csv.reader(lines(raw), delimiter=delim)
+        header = next(reader, [])
+        stats = [ColumnStats() for _ in header] if with_stats else []
+        checkpoints = []
+        first_row = None
+        n_rows = 0
+        row_start = pos
+        for row in reader:
+            if not n_rows % checkpoint_every:
+                checkpoints.append((n_rows, row_start))
+            if first_row is None:
+                first_row = row
+            n_rows += 1
+            for col, value in zip(stats, row):
+                col.add(value)
+            if on_progress and not n_rows % 10_000:
+                on_progress(pos)
+            row_start = pos
+        if on_progress:
+            on_progress(pos)
+    return header, first_row, n_rows, stats, checkpoints
+
+
+def split_ranges(mm, start: int, parts: int):
+    """Split ``mm[start:]`` into about ``parts`` byte ranges ending on newlines."""
+    size = len(mm)
+    step = max((size - start) // max(parts, 1), 1)
+    bounds = [start]
+    while bounds[-1] < size:
+        nl = mm.find(b"\n", min(bounds[-1] + step, size) - 1)
+        bounds.append(size if nl == -1 else nl + 1)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _iter_blocks(mm, start: int, end: int, block: int = 1 << 22):
+    """Yield newline-aligned slices of ``mm[start:end]`` of about ``block`` bytes."""
+    pos = start
+    while pos < end:
+        stop = min(pos + block, end)
+        if stop < end:
+            nl = mm.find(b"\n", stop - 1, end)
+            stop = end if nl == -1 else nl + 1
+        yield mm[pos:stop]
+        pos = stop
+
+
+def _scan_range(path: str, start: int, end: int, delim: str, encoding: str, ncols: int, with_stats: bool):
+    """Worker: scan one byte range of a CSV through a shared memory map.
+
+    Checkpoints are recorded at each block start as ``(local_row, offset)``.
+    """
+    stats = [ColumnStats() for _ in range(ncols)] if with_stats else []
+    checkpoints = []
+    first_row = None
+    n_rows = 0
+    offset = start
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for block in _iter_blocks(mm, start, end):
+            checkpoints.append((n_rows, offset))
+            offset += len(block)
+            for row in csv.reader(io.StringIO(block.decode(encoding), newline=""), delimiter=delim):
+                if first_row is None:
+                    first_row = row
+                n_rows += 1
+                for col, value in zip(stats, row):
+                    col.add(value)
+    return first_row, n_rows, stats, checkpoints
+
+
+def parallel_scan_csv(path: str, delim: str, encoding: str = "utf-8", with_stats: bool = True,
+                      workers: int = 2, on_progress=None):
+    """Like ``scan_csv`` but scans newline-aligned byte ranges in a process pool.
+
+    The file is memory-mapped so workers read straight from the page cache.
+    Per-range ``ColumnStats`` are merged in file order and checkpoints fall
+    on the ~4 MiB block boundaries. Assumes no quoted field contains a
+    newline, since ranges are split on raw newline bytes.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if os.path.getsize(path) == 0:
+        return [], None, 0, [], []
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header = next(csv.reader([mm.readline().decode(encoding)], delimiter=delim), [])
+        ranges = split_ranges(mm, mm.tell(), workers * 4)
+
+    first_row, n_rows, stats = None, 0, [ColumnStats() for _ in header] if with_stats else []
+    checkpoints = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_scan_range, path, lo, hi, delim, encoding, len(header), with_stats): (lo, hi)
+            for lo, hi in ranges
+        }
+        # Report bytes of completed ranges; results are merged in file order below
+        done = ranges[0][0] if ranges else 0
+        for future in as_completed(futures):
+            lo, hi = futures[future]
+            done += hi - lo
+            if on_progress:
+                on_progress(done)
+        for future in futures:
+            part_first, part_rows, part_stats, part_checkpoints = future.result()
+            if first_row is None:
+                first_row = part_first
+            checkpoints.extend((n_rows + row, offset) for row, offset in part_checkpoints)
+            n_rows += part_rows
+            for col, other in zip(stats, part_stats):
+                col.merge(other)
+    return header, first_row, n_rows, stats, checkpoints
+
+
+def index_path(path: str) -> str:
+    return path + ".idx.json"
+
+
+def fingerprint(path: str, sample: int = 1 << 16) -> dict:
+    """Cheap identity of a file: size, mtime and a hash of its first/last bytes."""
+    st = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        digest.update(fh.read(sample))
+        if st.st_size > sample:
+            fh.seek(max(st.st_size - sample, sample))
+            digest.update(fh.read(sample))
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest.hexdigest()}
+
+
+def load_index(path: str, delim: str, encoding: str):
+    """Return the sidecar index of ``path`` if it matches the file and options."""
+    try:
+        with open(index_path(path), encoding="utf-8") as fh:
+            idx = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if (idx.get("version") != INDEX_VERSION or idx.get("delim") != delim
+            or idx.get("encoding") != encoding or idx.get("fingerprint") != fingerprint(path)):
+        return None
+    return idx
+
+
+def save_index(path: str, idx: dict) -> None:
+    tmp = index_path(path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(idx, fh)
+    os.replace(tmp, index_path(path))
+
+
+def read_row(path: str, checkpoints, row: int, delim: str, encoding: str):
+    """Fetch data row ``row`` by seeking to the nearest checkpoint before it."""
+    pos = bisect.bisect_right([r for r, _ in checkpoints], row) - 1
+    if pos < 0:
+        return None
+    base, offset = checkpoints[pos]
+    with open(path, "rb") as raw:
+        raw.seek(offset)
+        reader = csv.reader((line.decode(encoding) for line in raw), delimiter=delim)
+        return next(itertools.islice(reader, row - base, None), None)
+
 
 @app.command()
-def summarize(ctx: typer.Context, path: str, delim: str = ","):
-    """Summarize a CSV file: number of rows and show first row."""
+def summarize(
+    ctx: typer.Context,
+    path: str,
+    delim: str = ",",
+    encoding: str = typer.Option("utf-8", help="File encoding"),
+    stats: bool = typer.Option(True, "--stats/--no-stats", help="Compute per-column types, nulls and min/max"),
+    fast_count: bool = typer.Option(False, "--fast-count", help="Only count rows via raw newline scan (no quoted newlines)"),
+    workers: int = typer.Option(1, "--workers", "-w", min=1, help="Scan byte ranges in N processes (no quoted newlines)"),
+    row: int = typer.Option(None, "--row", min=0, help="Also show data row N (0-based), seeking via the index"),
+    use_index: bool = typer.Option(True, "--index/--no-index", help="Reuse/write a <path>.idx.json sidecar for unchanged files"),
+):
+    """Summarize a CSV file: number of rows and show first row.
+
+    The file is streamed once, so memory use does not grow with its size.
+    Results are cached in a sidecar index and reused while the file is unchanged.
+    """
+    from rich.progress import Progress
+    from rich.table import Table
+
+    console = get_console()
     _debug(ctx, f"Summarizing path='{path}' delim='{delim}'")
     try:
-        rows = list(track(csv.DictReader(open(path), delimiter=delim), description="Reading"))
+        size = os.path.getsize(path)
+        idx = load_index(path, delim, encoding) if use_index else None
+        if idx is not None and (idx["stats"] is not None or not stats):
+            _debug(ctx, f"Using index {index_path(path)}")
+        elif fast_count and row is None:
+            # Parse just the first two lines for the header and first row
+            with open(path, newline="", encoding=encoding) as fh:
+                head = list(itertools.islice(csv.reader(fh, delimiter=delim), 2))
+            idx = {
+                "header": head[0] if head else [],
+                "first_row": head[1] if len(head) > 1 else None,
+                "rows": count_lines(path),
+                "stats": None,
+            }
+        else:
+            fp = fingerprint(path)
+            scan = scan_csv if workers == 1 else functools.partial(parallel_scan_csv, workers=workers)
+            with Progress(console=console, transient=True) as progress:
+                task = progress.add_task("Reading", total=size)
+                header, first_row, n_rows, col_stats, checkpoints = scan(
+                    path, delim, encoding, with_stats=stats,
+                    on_progress=lambda pos: progress.update(task, completed=pos),
+                )
+            idx = {
+                "version": INDEX_VERSION,
+                "delim": delim,
+                "encoding": encoding,
+                "fingerprint": fp,
+                "header": header,
+                "first_row": first_row,
+                "rows": n_rows,
+                "stats": [c.to_dict() for c in col_stats] if stats else None,
+                "checkpoints": checkpoints,
+            }
+            if use_index:
+                try:
+                    save_index(path, idx)
+                    _debug(ctx, f"Wrote index {index_path(path)}")
+                except OSError as e:
+                    _debug(ctx, f"Could not write index: {e}")
     except FileNotFoundError:
         console.print("[red]File not found[/]")
         raise typer.Exit(code=2)
+    header, first_row = idx["header"], idx["first_row"]
+    col_stats = [ColumnStats.from_dict(d) for d in idx["stats"]] if stats and idx["stats"] else []
     table = Table(title="Summary")
     table.add_column("rows")
     table.add_column("columns")
-    n_rows = len(rows)
-    n_cols = len(rows[0].keys()) if rows else 0
-    table.add_row(str(n_rows), str(n_cols))
+    table.add_row(str(idx["rows"]), str(len(header)))
     console.print(table)
-    if rows:
+    if col_stats:
+        t_cols = Table(title="Columns")
+        for name in ("column", "type", "nulls", "min", "max"):
+            t_cols.add_column(name)
+        for name, col in zip(header, col_stats):
+            lo, hi = col.bounds
+            t_cols.add_row(name, col.type_name, str(col.nulls), "" if lo is None else str(lo), "" if hi is None else str(hi))
+        console.print(t_cols)
+    if first_row is not None:
         console.rule("First Row")
-        t2 = Table(*rows[0].keys(), title="Row 0")
-        t2.add_row(*[str(v) for v in rows[0].values()])
+        t2 = Table(*header, title="Row 0")
+        t2.add_row(*[str(v) for v in first_row])
         console.print(t2)
+    if row is not None:
+        values = read_row(path, idx["checkpoints"], row, delim, encoding) if row < idx["rows"] else None
+        if values is None:
+            console.print(f"[red]Row {row} is out of range ({idx['rows']} rows)[/]")
+            raise typer.Exit(code=2)
+        console.rule(f"Row {row}")
+        t3 = Table(*header, title=f"Row {row}")
+        t3.add_row(*[str(v) for v in values])
+        console.print(t3)
 
 import time 
-from rich.progress import Progress
+
+# Worker-side progress counter, set per process by _init_long_worker
+_reporter = None
+
+
+def _init_long_worker(queue) -> None:
+    global _reporter
+    from batched_progress import QueueReporter
+
+    _reporter = QueueReporter(queue)
+
+
+def _long_worker(steps: int, delay: float) -> int:
+    update = _reporter.update
+    for _ in range(steps):
+        if delay:
+            time.sleep(delay)
+        update()
+    _reporter.flush()
+    return steps
+
+
 @app.command()
-def longfunction(ctx: typer.Context):
-    """This is a very long function with progress tracking."""
-    _debug(ctx, "Starting long function")
-    
-    
-    with Progress(console=console) as progress:
-        task = progress.add_task("[cyan]Processing...", total=10)
-        for i in range(10):
-            time.sleep(1)
-            progress.update(task, advance=1)
-    
-    console.print("[green]✓[/green] Long function completed!")
+def longfunction(
+    ctx: typer.Context,
+    steps: int = typer.Option(10, min=0, help="Number of steps to process"),
+    delay: float = typer.Option(1.0, min=0.0, help="Seconds of simulated work per step"),
+    workers: int = typer.Option(0, "--workers", "-w", min=0, help="Split the steps across N processes reporting into one bar"),
+    miniters: int = typer.Option(0, min=0, help="Redraw every N steps (0 = about every 0.1s)"),
+):
+    """This is a very long function with progress tracking.
+
+    Progress updates are batched, so millions of tiny steps (`--delay 0`)
+    cost little more than the bare loop; off a terminal the bar is silent.
+    """
+    from batched_progress import BatchedProgress
 
+    console = get_console()
+    _debug(ctx, f"Starting long function: steps={steps}, delay={delay}, workers={workers}")
+
+    with BatchedProgress(total=steps, desc="[cyan]Processing...", backend="rich",
+                         console=console, miniters=miniters) as bar:
+        if workers:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            shares = [steps // workers + (i < steps % workers) for i in range(workers)]
+            with bar.listen(multiprocessing.Queue()) as queue:
+                with ProcessPoolExecutor(workers, initializer=_init_long_worker, initargs=(queue,)) as pool:
+                    list(pool.map(_long_worker, shares, [delay] * workers))
+        else:
+            update = bar.update
+            for _ in range(steps):
+                if delay:
+                    time.sleep(delay)
+                update()
+
+    console.print("[green]✓[/green] Long function completed!")
 
 
 if __name__ == "__main__":
@@ -4,21 +4,98 @@ from __future__ import annotations
 import json
 import os
 import platform
+import stat
+import struct
+import sys
+import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Literal, Optional
 
 import typer
 
+# Shared helpers from src/common, imported where they are used
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+
 __version__ = "0.2.0"
 
+# `serve` wire format: the client sends one JSON line with argv, cwd and env;
+# the daemon answers with frames of (channel, length) + payload where channel
+# is b"o" (stdout), b"e" (stderr) or b"x" (exit code, ends the reply)
+FRAME = struct.Struct(">cI")
+
 app = typer.Typer(add_completion=True, no_args_is_help=True, help="""
 Typer CLI example demonstrating:
 - Global options via callback (verbosity, config, version)
-- Multiple subcommands (run, greet, info)
+- Multiple subcommands (run, greet, info, serve)
 - Error handling and basic diagnostics
 """)
 
+# Per-request state while serving: the client's cwd/env and output channels
+_request = threading.local()
+# Parsed configs keyed by path: (mtime_ns, size, data)
+_config_cache: dict = {}
+# tracemalloc (and cProfile on newer Pythons) is process-wide, so the daemon
+# runs --profile requests one at a time
+_profile_lock = threading.Lock()
+
+
+def default_socket_path() -> str:
+    """Socket used by `serve` and client.py: $TYPER_DEMO_SOCKET or a per-user path.
+
+    Without $XDG_RUNTIME_DIR the socket lives in a private /tmp/typer-demo-<uid>
+    directory rather than directly in the shared /tmp.
+    """
+    if os.getenv("TYPER_DEMO_SOCKET"):
+        return os.environ["TYPER_DEMO_SOCKET"]
+    if os.getenv("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], f"typer-demo-{os.getuid()}.sock")
+    return os.path.join("/tmp", f"typer-demo-{os.getuid()}", "daemon.sock")
+
+
+def _private_dir(path: str) -> None:
+    """Create `path` with mode 0700, or check that an existing one is ours and private."""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        typer.echo(f"{path} must be a directory owned by you with mode 0700", err=True)
+        raise typer.Exit(1)
+
+
+def _getenv(name: str) -> Optional[str]:
+    """Environment lookup that sees the client's variables when serving."""
+    env = getattr(_request, "env", None)
+    return env.get(name) if env is not None else os.getenv(name)
+
+
+def _cwd() -> Path:
+    return Path(getattr(_request, "cwd", None) or Path.cwd())
+
+
+def load_config(path: Path):
+    """Best-effort JSON load, reparsed only when the file's mtime or size changes."""
+    path = _cwd() / path
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = str(path)
+    cached = _config_cache.get(key)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    try:
+        # Try JSON first; for real apps consider tomllib/yaml as needed
+        data = json.loads(path.read_text())
+    except Exception:
+        # Keep going; config is optional in this demo
+        data = None
+    _config_cache[key] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
 
 def _version_callback(value: bool):
     if value:
@@ -32,24 +109,32 @@ def main(
     verbose: int = typer.Option(0, "--verbose", "-v", count=True, help="Increase verbosity (repeatable)"),
     config: Optional[Path] = typer.Option(None, "--config", "-c", help="Path to a config file (INI/JSON/simple JSON lines)"),
     version: Optional[bool] = typer.Option(None, "--version", callback=_version_callback, is_eager=True, help="Show version and exit"),
+    profile: Optional[Literal["cpu", "mem", "all"]] = typer.Option(None, "--profile", help="Report hot functions (cpu), peak allocation sites (mem) or both for the command"),
+    profile_output: Optional[Path] = typer.Option(None, "--profile-output", dir_okay=False, help="Write the profile report here instead of stderr (.prof: raw cProfile data)"),
 ):
     """Initialize shared state and parse global options.
 
     - Stores verbosity level and config path in ctx.obj
     - If --config is provided and exists, a best-effort JSON load is attempted
+      (cached by mtime, so a `serve` daemon only reparses changed files)
+    - --profile wraps the subcommand in cProfile and/or tracemalloc
+      (see src/common/cli_profiling.py)
     """
     ctx.ensure_object(dict)
     ctx.obj["verbose"] = verbose
     ctx.obj["config_path"] = str(config) if config else None
-    ctx.obj["config"] = None
+    ctx.obj["config"] = load_config(config) if config else None
+    if profile:
+        _profile(ctx, profile, str(_cwd() / profile_output) if profile_output else None)
 
-    if config and config.exists():
-        try:
-            # Try JSON first; for real apps consider tomllib/yaml as needed
-            ctx.obj["config"] = json.loads(Path(config).read_text())
-        except Exception:
-            # Keep going; config is optional in this demo
-            pass
+
+def _profile(ctx: typer.Context, mode: str, output: Optional[str]) -> None:
+    """Profile the rest of this invocation, reporting when the context closes."""
+    from cli_profiling import profiled
+
+    if getattr(_request, "env", None) is not None:
+        ctx.with_resource(_profile_lock)
+    ctx.with_resource(profiled(mode, output))
 
 
 def _debug(ctx: typer.Context, msg: str) -> None:
@@ -58,19 +143,76 @@ def _debug(ctx: typer.Context, msg: str) -> None:
         typer.echo(f"[v{v}] {msg}", err=True)
 
 
+def _run_serial(limit: int, delay: float, emit: Callable[[int], None]) -> None:
+    for i in range(limit):
+        emit(i)
+        if delay:
+            time.sleep(delay)
+
+
+async def _run_concurrent(limit: int, delay: float, concurrency: int, emit: Callable[[int], None]) -> None:
+    """Overlap the per-step waits, keeping at most `concurrency` in flight.
+
+    Steps are awaited in submission order, so output stays ordered while a
+    sliding window of pending steps keeps memory flat for large limits.
+    """
+    import asyncio
+
+    async def step(i: int) -> int:
+        await asyncio.sleep(delay)
+        return i
+
+    pending: deque[asyncio.Task] = deque()
+    for i in range(limit):
+        if len(pending) >= concurrency:
+            emit(await pending.popleft())
+        pending.append(asyncio.create_task(step(i)))
+    while pending:
+        emit(await pending.popleft())
+
+
+def _execute(limit: int, delay: float, concurrency: int, emit: Callable[[int], None]) -> float:
+    if concurrency > 1:
+        # asyncio takes ~50ms to import; only pay for it when used, before timing
+        import asyncio
+    start = time.perf_counter()
+    if concurrency > 1:
+        asyncio.run(_run_concurrent(limit, delay, concurrency, emit))
+    else:
+        _run_serial(limit, delay, emit)
+    return time.perf_counter() - start
+
+
 @app.command()
 def run(
     ctx: typer.Context,
     limit: int = typer.Option(5, min=0, help="Number of iterations to run"),
     delay: float = typer.Option(0.1, min=0.0, help="Seconds to sleep per step (simulated work)"),
     dry_run: bool = typer.Option(False, help="Plan only; do not perform the delay"),
+    concurrency: int = typer.Option(1, "--concurrency", "-j", min=1, help="Overlap up to N simulated waits with asyncio (1 = serial)"),
+    compare: bool = typer.Option(False, help="Time the serial and concurrent modes and report the speedup"),
+    buffered: bool = typer.Option(False, help="Write output in large blocks (applies when there is no delay)"),
 ):
     """Run a small loop to demonstrate options, validation, and logging."""
-    _debug(ctx, f"Starting run: limit={limit}, delay={delay}, dry_run={dry_run}")
-    for i in range(limit):
-        typer.echo(f"typer: {i}")
-        if not dry_run and delay:
-            time.sleep(delay)
+    _debug(ctx, f"Starting run: limit={limit}, delay={delay}, dry_run={dry_run}, concurrency={concurrency}")
+    delay = 0.0 if dry_run else delay
+    if compare:
+        width = max(concurrency, 2)
+        serial = _execute(limit, delay, 1, lambda i: None)
+        concurrent = _execute(limit, delay, width, lambda i: None)
+        typer.echo(f"serial: {serial:.3f}s")
+        typer.echo(f"concurrent (x{width}): {concurrent:.3f}s")
+        typer.echo(f"speedup: {serial / concurrent if concurrent else float('inf'):.1f}x")
+    else:
+        from bulk_output import silence_broken_pipe, write_lines
+
+        # A closed pipe (`| head`) ends the command quietly with status 1;
+        # under `serve` stdout is the client's socket and is left as is
+        with silence_broken_pipe():
+            if buffered and not delay:
+                write_lines("typer: ", limit, sys.stdout.buffer)
+            else:
+                _execute(limit, delay, concurrency, lambda i: typer.echo(f"typer: {i}"))
     _debug(ctx, "Run completed")
 
 
@@ -97,11 +239,11 @@ def info(
     data = {
         "python": platform.python_version(),
         "platform": platform.platform(),
-        "cwd": str(Path.cwd()),
+        "cwd": str(_cwd()),
         "verbose": ctx.obj.get("verbose", 0) if ctx.obj else 0,
         "config_path": ctx.obj.get("config_path") if ctx.obj else None,
         "config": ctx.obj.get("config") if ctx.obj else None,
-        "demo_api_key_set": bool(os.getenv("DEMO_API_KEY")),
+        "demo_api_key_set": bool(_getenv("DEMO_API_KEY")),
     }
     if json_out:
         typer.echo(json.dumps(data))
@@ -110,5 +252,188 @@ def info(
             typer.echo(f"{k}: {v}")
 
 
+class _Channel:
+    """Binary stream that sends each write to the client as one frame."""
+
+    def __init__(self, sock, tag: bytes, lock: threading.Lock):
+        self._sock, self._tag, self._lock = sock, tag, lock
+
+    def write(self, data) -> int:
+        if data:
+            with self._lock:
+                self._sock.sendall(FRAME.pack(self._tag, len(data)))
+                self._sock.sendall(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+class _TextChannel:
+    """Text wrapper over a _Channel, enough for typer.echo, print and .buffer."""
+
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, binary: _Channel):
+        self.buffer = binary
+
+    def write(self, text: str) -> int:
+        self.buffer.write(text.encode(self.encoding))
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def fileno(self) -> int:
+        import io
+
+        raise io.UnsupportedOperation("output is forwarded to a client socket")
+
+
+class _Routed:
+    """Stand-in for sys.stdout/stderr that writes to the current request's channel.
+
+    Each request runs in its own thread, so output is routed per thread and
+    falls back to the daemon's own stream outside of requests.
+    """
+
+    def __init__(self, name: str, fallback):
+        self._name, self._fallback = name, fallback
+
+    def _target(self):
+        return getattr(_request, self._name, None) or self._fallback
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, attr):
+        return getattr(self._target(), attr)
+
+
+def _handle_client(sock, command) -> None:
+    """Run one forwarded invocation and stream its output back."""
+    lock = threading.Lock()
+    with sock.makefile("rb") as reader:
+        request = json.loads(reader.readline() or b"{}")
+    argv = list(request.get("argv", []))
+    _request.cwd = request.get("cwd")
+    _request.env = dict(request.get("env", {}))
+    _request.stdout = _TextChannel(_Channel(sock, b"o", lock))
+    _request.stderr = _TextChannel(_Channel(sock, b"e", lock))
+    code = 0
+    try:
+        if argv[:1] == ["serve"]:
+            typer.echo("Error: cannot start a daemon from a client", err=True)
+            code = 2
+        else:
+            command.main(args=argv, prog_name="app.py", standalone_mode=True)
+    except SystemExit as e:
+        if isinstance(e.code, str):
+            typer.echo(e.code, err=True)
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        typer.echo(f"Error: {type(e).__name__}: {e}", err=True)
+        code = 1
+    finally:
+        for name in ("cwd", "env", "stdout", "stderr"):
+            delattr(_request, name)
+    with lock:
+        sock.sendall(FRAME.pack(b"x", len(str(code))) + str(code).encode())
+
+
+@app.command()
+def serve(
+    ctx: typer.Context,
+    socket_path: Path = typer.Option(None, "--socket", help="Unix socket to listen on [default: $TYPER_DEMO_SOCKET or a per-user path]"),
+    idle_timeout: float = typer.Option(0.0, min=0.0, help="Exit after this many idle seconds (0 = never)"),
+):
+    """Keep a warm process on a Unix socket for client.py (run, greet, info).
+
+    Imports, the command tree and parsed configs stay in memory, so a
+    forwarded call skips interpreter and framework startup. Requests run in
+    threads, each with its own cwd, environment and output stream.
+    """
+    import signal
+    import socket
+    import socketserver
+
+    if not hasattr(socket, "AF_UNIX"):
+        typer.echo("serve needs Unix domain sockets", err=True)
+        raise typer.Exit(1)
+    path = str(socket_path or default_socket_path())
+    if socket_path is None and not os.getenv("TYPER_DEMO_SOCKET") and not os.getenv("XDG_RUNTIME_DIR"):
+        _private_dir(os.path.dirname(path))
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+            typer.echo(f"A daemon is already listening on {path}", err=True)
+            raise typer.Exit(1)
+        except OSError:
+            probe.close()
+            try:
+                os.unlink(path)  # stale socket from a daemon that died
+            except OSError as e:
+                typer.echo(f"Cannot remove stale socket {path}: {e.strerror}", err=True)
+                raise typer.Exit(1)
+        finally:
+            probe.close()
+
+    command = typer.main.get_command(app)
+    active = [0]
+    last_seen = [time.monotonic()]
+    counter_lock = threading.Lock()
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            with counter_lock:
+                active[0] += 1
+            try:
+                _handle_client(self.request, command)
+            except OSError:
+                pass  # client went away mid-reply
+            finally:
+                with counter_lock:
+                    active[0] -= 1
+                    last_seen[0] = time.monotonic()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    sys.stdout = _Routed("stdout", sys.stdout)
+    sys.stderr = _Routed("stderr", sys.stderr)
+    old_umask = os.umask(0o177)  # socket readable/writable by this user only
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    server.timeout = 0.5
+    _debug(ctx, f"Serving on {path} (idle timeout: {idle_timeout or 'none'})")
+    typer.echo(f"Listening on {path}", err=True)
+    try:
+        while True:
+            server.handle_request()
+            if idle_timeout and not active[0] and time.monotonic() - last_seen[0] > idle_timeout:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Thin client for `app.py serve`.
+
+Forwards its arguments to the warm daemon over a Unix socket and streams the
+command's stdout/stderr back, exiting with the command's status. Only the
+standard library is imported, so a call costs a bare interpreter start plus
+a socket round trip. Without a running daemon, or if the socket is not a
+private one owned by the current user, it runs `app.py` directly.
+
+Usage:
+  python app.py serve &                 # once
+  python client.py run --limit 3 --delay 0
+  python client.py -c sample.json info --json
+"""
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+
+# Shared helpers from src/common, imported where they are used
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+
+# Must match FRAME in app.py
+FRAME = struct.Struct(">cI")
+# Environment variables forwarded to the daemon (the app reads DEMO_API_KEY)
+ENV_PREFIX = "DEMO_"
+
+
+def default_socket_path() -> str:
+    # Must match default_socket_path in app.py
+    if os.getenv("TYPER_DEMO_SOCKET"):
+        return os.environ["TYPER_DEMO_SOCKET"]
+    if os.getenv("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], f"typer-demo-{os.getuid()}.sock")
+    return os.path.join("/tmp", f"typer-demo-{os.getuid()}", "daemon.sock")
+
+
+def _trusted(path: str) -> bool:
+    """True if `path` is a socket only this user can reach (as `serve` creates it).
+
+    The request carries DEMO_* variables such as DEMO_API_KEY, so a socket
+    planted by another user must never receive it.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def _peer_uid(sock):
+    """Uid of the process on the other end (Linux only, else None)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+
+def _run_locally(argv) -> None:
+    app = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    os.execv(sys.executable, [sys.executable, app, *argv])
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    path = default_socket_path()
+    if not _trusted(path):
+        if os.path.lexists(path):
+            sys.stderr.write(f"client: ignoring {path}: not a private socket owned by you\n")
+        _run_locally(argv)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        peer = _peer_uid(sock)
+    except OSError:
+        sock.close()
+        _run_locally(argv)
+    if peer is not None and peer != os.getuid():
+        sock.close()
+        sys.stderr.write(f"client: ignoring {path}: served by uid {peer}\n")
+        _run_locally(argv)
+    request = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": {k: v for k, v in os.environ.items() if k.startswith(ENV_PREFIX)},
+    }
+    from bulk_output import silence_broken_pipe
+
+    streams = {b"o": sys.stdout.buffer, b"e": sys.stderr.buffer}
+    # A closed pipe (`| head`) ends the client quietly with status 1
+    with sock, sock.makefile("rb") as reply, silence_broken_pipe():
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        while True:
+            header = reply.read(FRAME.size)
+            if len(header) < FRAME.size:
+                sys.stderr.write("client: daemon closed the connection\n")
+                return 1
+            channel, size = FRAME.unpack(header)
+            payload = reply.read(size)
+            if channel == b"x":
+                return int(payload)
+            streams[channel].write(payload)
+            streams[channel].flush()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,291 @@
+"""
+Low-overhead progress reporting for loops with millions of tiny steps.
+
+Calling ``bar.update(1)`` on a tqdm or Rich bar for every step costs far more
+than the step itself once loops reach tens of millions of iterations. This
+module keeps a plain integer counter in the hot path and only forwards the
+accumulated delta to the real renderer every ``miniters`` steps (fixed) or
+roughly every ``mininterval`` seconds (adaptive, the default).
+
+- ``BatchedProgress``: context manager around a tqdm or Rich bar. With
+  ``total=None`` it shows a rate-only counter. ``update()`` still costs one
+  Python call per step; ``track(iterable)`` counts in C and is cheaper than
+  both ``update()`` and iterating a tqdm bar directly.
+- ``QueueReporter``: worker-side counter for multiprocessing; it ships batched
+  deltas through a queue that ``BatchedProgress.listen()`` drains into one bar.
+- When the output stream is not a TTY (pipes, CI logs) the bar is a silent
+  no-op unless ``disable=False`` is passed explicitly.
+
+The apps in ``src/`` run as standalone scripts, so they put this directory on
+``sys.path`` before importing it.
+"""
+from __future__ import annotations
+
+import itertools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+from operator import itemgetter
+from typing import Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Upper bound for the adaptive batch size so a sudden slowdown is noticed
+MAX_BATCH = 1 << 20
+
+
+def _isatty(stream) -> bool:
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+class _TqdmBar:
+    def __init__(self, total, desc, file, **_):
+        from tqdm import tqdm
+
+        # Batching happens here, so let tqdm draw every update it receives
+        self._bar = tqdm(total=total, desc=desc, file=file, miniters=1, mininterval=0, unit_scale=True)
+
+    def update(self, n: int) -> None:
+        self._bar.update(n)
+
+    def close(self) -> None:
+        self._bar.close()
+
+
+class _RichBar:
+    def __init__(self, total, desc, file, console=None):
+        from rich.progress import (
+            BarColumn,
+            MofNCompleteColumn,
+            Progress,
+            ProgressColumn,
+            TextColumn,
+            TimeElapsedColumn,
+        )
+        from rich.text import Text
+
+        class RateColumn(ProgressColumn):
+            def render(self, task):
+                return Text(f"{task.speed:,.0f} it/s" if task.speed else "? it/s", style="progress.data.speed")
+
+        if console is None:
+            from rich.console import Console
+
+            console = Console(file=file)
+        columns = [TextColumn("[progress.description]{task.description}")]
+        if total is not None:
+            columns += [BarColumn(), MofNCompleteColumn()]
+        else:
+            columns += [TextColumn("{task.completed:,.0f} it")]
+        columns += [RateColumn(), TimeElapsedColumn()]
+        self._progress = Progress(*columns, console=console)
+        self._task = self._progress.add_task(desc, total=total)
+        self._progress.start()
+
+    def update(self, n: int) -> None:
+        self._progress.advance(self._task, n)
+
+    def close(self) -> None:
+        self._progress.refresh()
+        self._progress.stop()
+
+
+BACKENDS = {"tqdm": _TqdmBar, "rich": _RichBar}
+
+
+class BatchedProgress:
+    """Progress bar that only touches its renderer every so often.
+
+    Args:
+        total: expected number of steps, or None for a rate-only counter.
+        desc: label shown next to the bar.
+        miniters: forward updates every N steps. 0 (default) adapts the batch
+            size so the renderer is touched about every ``mininterval`` seconds.
+        mininterval: target seconds between renders in adaptive mode.
+        backend: "tqdm" or "rich".
+        disable: True/False to force; None disables when ``file`` is not a TTY.
+        file: output stream (default: stderr).
+        console: optional Rich console for the "rich" backend.
+    """
+
+    def __init__(
+        self,
+        total: Optional[int] = None,
+        desc: str = "",
+        *,
+        miniters: int = 0,
+        mininterval: float = 0.1,
+        backend: str = "tqdm",
+        disable: Optional[bool] = None,
+        file=None,
+        console=None,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}; choose from {sorted(BACKENDS)}")
+        file = file if file is not None else sys.stderr
+        if disable is None:
+            disable = not _isatty(console.file if console is not None else file)
+        self.total = total
+        self.desc = desc
+        self.n = 0
+        self.mininterval = mininterval
+        self.disabled = disable
+        self._fixed = miniters > 0
+        self._pending = 0
+        self._next = miniters if self._fixed else 1
+        self._rendered_at = time.perf_counter()
+        self._bar = None
+        if not disable:
+            self._bar = BACKENDS[backend](total, desc, file, console=console)
+        else:
+            # Shadow the method so a disabled bar costs a single no-op call
+            self.update = self._skip
+
+    def __enter__(self) -> "BatchedProgress":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _skip(self, n: int = 1) -> None:
+        pass
+
+    def update(self, n: int = 1) -> None:
+        self._pending += n
+        if self._pending >= self._next:
+            self._check()
+
+    def _check(self) -> None:
+        now = time.perf_counter()
+        elapsed = now - self._rendered_at
+        pending = self._pending
+        if self._fixed or elapsed >= self.mininterval:
+            self._render()
+            self._rendered_at = now
+        if self._fixed:
+            return
+        # Aim the next check at the moment mininterval will have elapsed
+        if elapsed > 0:
+            step = int(pending / elapsed * self.mininterval)
+        else:
+            step = pending * 2
+        self._next = self._pending + max(1, min(step - self._pending, MAX_BATCH))
+
+    def _render(self) -> None:
+        if self._pending:
+            self._bar.update(self._pending)
+            self.n += self._pending
+            self._pending = 0
+
+    def track(self, iterable: Iterable[T]) -> Iterator[T]:
+        """Iterate over ``iterable`` while counting each item.
+
+        Items flow through ``islice`` runs that end where the next check is
+        due and are counted by an ``itertools.count``, so only C code runs
+        per item and Python code only once per run.
+        """
+        if self.disabled:
+            return iter(iterable)
+        counter = itertools.count()
+        # zip takes the item first, so the counter only advances for real items
+        items = map(itemgetter(0), zip(iterable, counter))
+        return itertools.chain.from_iterable(self._runs(items, counter))
+
+    def _runs(self, items, counter):
+        probes = counted = 0
+        try:
+            while True:
+                want = max(self._next - self._pending, 1)
+                yield islice(items, want)
+                # Reading the counter advances it once more; probes corrects for that
+                total = next(counter) - probes
+                probes += 1
+                got, counted = total - counted, total
+                self.update(got)
+                if got < want:
+                    return
+        finally:
+            # Count the items handed out before a consumer stopped early
+            total = next(counter) - probes
+            if total > counted and self._bar is not None:
+                self.update(total - counted)
+
+    def close(self) -> None:
+        if self._bar is not None:
+            self._render()
+            self._bar.close()
+            self._bar = None
+
+    @contextmanager
+    def listen(self, queue) -> Iterator[Optional[object]]:
+        """Drain deltas sent by ``QueueReporter`` workers into this bar.
+
+        Yields the queue to hand to the workers, or None when the bar is
+        disabled so workers skip reporting entirely.
+        """
+        if self.disabled:
+            yield None
+            return
+
+        def drain():
+            for delta in iter(queue.get, None):
+                self.update(delta)
+
+        thread = threading.Thread(target=drain, name="progress-listener", daemon=True)
+        thread.start()
+        try:
+            yield queue
+        finally:
+            queue.put(None)
+            thread.join()
+
+
+class QueueReporter:
+    """Worker-side counter that sends batched deltas to a parent bar.
+
+    Create one per worker process (e.g. in a pool initializer) with the queue
+    yielded by ``BatchedProgress.listen()``; a None queue makes every call a
+    no-op. Call ``flush()`` when a task finishes so no steps are lost.
+    """
+
+    def __init__(self, queue, *, miniters: int = 0, mininterval: float = 0.1):
+        self.queue = queue
+        self.miniters = miniters
+        self.mininterval = mininterval
+        self._pending = 0
+        self._next = miniters or 1
+        self._sent_at = time.perf_counter()
+        if queue is None:
+            self.update = self._skip
+            self.flush = self._skip
+
+    def _skip(self, n: int = 1) -> None:
+        pass
+
+    def update(self, n: int = 1) -> None:
+        self._pending += n
+        if self._pending >= self._next:
+            self._check()
+
+    def _check(self) -> None:
+        now = time.perf_counter()
+        elapsed = now - self._sent_at
+        pending = self._pending
+        if self.miniters or elapsed >= self.mininterval:
+            self.flush()
+            self._sent_at = now
+        if self.miniters:
+            self._next = self.miniters
+            return
+        step = int(pending / elapsed * self.mininterval) if elapsed > 0 else pending * 2
+        self._next = self._pending + max(1, min(step - self._pending, MAX_BATCH))
+
+    def flush(self) -> None:
+        if self._pending:
+            self.queue.put(self._pending)
+            self._pending = 0
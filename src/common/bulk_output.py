@@ -0,0 +1,56 @@
+"""
+Bulk text output for the example CLIs.
+
+- ``write_lines``: writes numbered ``"<prefix><i>"`` lines in blocks of
+  ``BLOCK_LINES`` with one ``write()`` each, instead of one print per line.
+- ``silence_broken_pipe``: ends a command quietly with status 1 when the
+  reader closes the pipe early (``| head``).
+
+The apps in ``src/`` run as standalone scripts, so they put this directory on
+``sys.path`` before importing it.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from contextlib import contextmanager
+from typing import Iterator
+
+# Lines per write() (~1 MiB blocks for short lines)
+BLOCK_LINES = 65_536
+
+
+def write_lines(prefix: str, limit: int, out, block_lines: int = BLOCK_LINES) -> None:
+    """Write "<prefix><i>" lines for i < limit to a binary stream in blocks."""
+    sep = "\n" + prefix
+    for start in range(0, limit, block_lines):
+        block = range(start, min(start + block_lines, limit))
+        out.write((prefix + sep.join(map(str, block)) + "\n").encode())
+    out.flush()
+
+
+def discard_stdout() -> None:
+    """Point the stdout fd at /dev/null so the final flush at exit cannot fail.
+
+    Streams without an fd of their own, such as a daemon's per-request
+    socket channel, are left alone.
+    """
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, fd)
+    finally:
+        os.close(devnull)
+
+
+@contextmanager
+def silence_broken_pipe(code: int = 1) -> Iterator[None]:
+    """Turn a BrokenPipeError in the block into a quiet exit with ``code``."""
+    try:
+        yield
+    except BrokenPipeError:
+        discard_stdout()
+        raise SystemExit(code)
@@ -0,0 +1,178 @@
+"""
+CPU and memory profiling of a whole CLI invocation, behind a ``--profile`` option.
+
+``profiled()`` is a context manager the CLIs enter from their top-level
+callback with ``ctx.with_resource(...)``, so it wraps whichever subcommand
+runs and reports once the command is done, also when it fails or exits
+early. Modes:
+
+- ``cpu``: cProfile; the hottest functions sorted by cumulative time.
+- ``mem``: tracemalloc; peak traced memory and the allocation sites holding
+  the most memory at the largest point sampled during the run.
+- ``all``: both. tracemalloc slows allocation-heavy code down noticeably,
+  so read CPU times from a ``cpu`` run.
+
+cProfile only sees the thread that entered the context; time spent in
+worker threads or processes shows up as the wait for them. Reports go to
+stderr unless an output path is given; a path ending in ``.prof`` receives
+the raw cProfile data instead (for ``pstats`` or snakeviz), with the memory
+report still on stderr.
+
+The apps in ``src/`` run as standalone scripts, so they put this directory on
+``sys.path`` before importing it. The module name avoids the standard
+library's ``profiling`` package, which ``cProfile`` imports on newer Pythons
+and which a plain ``profiling.py`` here would shadow.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+MODES = ("cpu", "mem", "all")
+
+# Functions and allocation sites listed in each report
+TOP = 25
+
+# How often the memory sampler checks the traced size, and by how much it must
+# grow past the last snapshot before a new one is taken
+SAMPLE_INTERVAL = 0.01
+SNAPSHOT_GROWTH = 1.1
+
+
+def _format_size(n: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+class _PeakSampler:
+    """Background thread keeping the tracemalloc snapshot taken closest to the peak.
+
+    tracemalloc records the peak size but not where that memory came from,
+    so the traced size is polled and a snapshot taken whenever it has grown
+    by ``SNAPSHOT_GROWTH`` since the last one.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.size = 0
+        self.snapshot = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tracemalloc-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def sample(self) -> None:
+        import tracemalloc
+
+        current, _ = tracemalloc.get_traced_memory()
+        if self.snapshot is None or current > self.size * SNAPSHOT_GROWTH:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.size = current
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def _memory_report(sampler: _PeakSampler, peak: int, out, top: int) -> None:
+    import linecache
+    import tracemalloc
+
+    snapshot = sampler.snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+    stats = snapshot.statistics("lineno")
+    out.write(f"\nMemory: peak {_format_size(peak)} traced; top allocation sites "
+              f"with {_format_size(sampler.size)} live:\n")
+    out.write(f"{'size':>11} {'blocks':>9}  location\n")
+    for stat in stats[:top]:
+        frame = stat.traceback[0]
+        source = linecache.getline(frame.filename, frame.lineno).strip()
+        out.write(f"{_format_size(stat.size):>11} {stat.count:>9}  {frame.filename}:{frame.lineno}\n")
+        if source:
+            out.write(f"{'':>22}{source[:100]}\n")
+
+
+@contextmanager
+def profiled(mode: str, output: Optional[str] = None, top: int = TOP, sort: str = "cumulative") -> Iterator[None]:
+    """Profile the enclosed block and write a report when it ends.
+
+    ``mode`` is one of ``MODES``. ``output`` is a report path (default
+    stderr), or a ``.prof`` path for the raw cProfile data.
+    """
+    if mode not in MODES:
+        raise ValueError(f"profile mode must be one of: {', '.join(MODES)}")
+    cpu = mode in ("cpu", "all")
+    mem = mode in ("mem", "all")
+
+    # Import everything before tracing starts so loading the profiling
+    # machinery itself is not reported as an allocation site
+    profiler = None
+    if cpu:
+        import cProfile
+        import pstats  # noqa: F401
+
+        profiler = cProfile.Profile()
+    sampler = None
+    if mem:
+        import linecache  # noqa: F401
+        import tracemalloc
+
+        tracemalloc.start()
+        sampler = _PeakSampler()
+        sampler.start()
+    started = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        wall = time.perf_counter() - started
+        peak = 0
+        if sampler is not None:
+            sampler.stop()
+            _, peak = tracemalloc.get_traced_memory()
+        _write_report(profiler, sampler, peak, wall, output, top, sort)
+        if sampler is not None:
+            tracemalloc.stop()
+
+
+def _write_report(profiler, sampler, peak: int, wall: float, output: Optional[str], top: int, sort: str) -> None:
+    raw = profiler is not None and output is not None and output.endswith(".prof")
+    if raw:
+        profiler.dump_stats(output)
+    to_file = output is not None and not raw
+    out = open(output, "w", encoding="utf-8") if to_file else sys.stderr
+    try:
+        out.write(f"Profile: {wall:.3f}s wall\n")
+        if profiler is not None and raw:
+            out.write(f"cProfile data written to {output}\n")
+        elif profiler is not None:
+            import pstats
+
+            out.write(f"\nCPU: top {top} functions by {sort} time\n")
+            pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(top)
+        if sampler is not None:
+            _memory_report(sampler, peak, out, top)
+        out.flush()
+    finally:
+        if to_file:
+            out.close()
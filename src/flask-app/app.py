@@ -1,10 +1,232 @@
 #!/usr/bin/env python3
-from flask import Flask, render_template, request, redirect, url_for
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import queue
+import secrets
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from pathlib import Path
+
+from flask import Flask, Response, abort, jsonify, make_response, render_template, request, redirect, url_for
+from werkzeug.security import safe_join
 
 app = Flask(__name__)
+app.config["DATABASE"] = os.getenv("PROFILE_DB", str(Path(__file__).with_name("profiles.sqlite3")))
+app.config["DB_POOL_SIZE"] = int(os.getenv("PROFILE_DB_POOL", "8"))
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+
+FIELDS = ("name", "email", "role", "bio", "subscribe")
+# Returned by the unauthenticated read API; email and token stay private
+PUBLIC_FIELDS = ("id", "name", "role", "bio", "subscribe", "created_at")
+MAX_PAGE = 500
+# Larger render contexts (e.g. a long bio in the query string) are not memoized
+MAX_CACHED_CONTEXT = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL DEFAULT '',
+    bio TEXT NOT NULL DEFAULT '',
+    subscribe INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    token TEXT
+)
+"""
+
+
+def migrate(conn):
+    """Create the table, adding and backfilling ``token`` on older databases."""
+    conn.execute(SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(profiles)")}
+    if "token" not in columns:
+        try:
+            conn.execute("ALTER TABLE profiles ADD COLUMN token TEXT")
+        except sqlite3.OperationalError as e:
+            # Another worker added it first
+            if "duplicate column" not in str(e):
+                raise
+    conn.execute("UPDATE profiles SET token = lower(hex(randomblob(16))) WHERE token IS NULL")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS profiles_token ON profiles (token)")
+    conn.commit()
+
+
+class ConnectionPool:
+    """A fixed-size pool of SQLite connections shared by request threads.
+
+    Connections are opened lazily, use WAL so readers do not block the
+    writer, and are handed out through a queue so each one is used by a
+    single thread at a time.
+    """
+
+    def __init__(self, path, size=8):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        migrate(conn)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commits on success, rolls back on error."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            conn = self._connect() if can_open else self._idle.get()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+
+pool = ConnectionPool(app.config["DATABASE"], app.config["DB_POOL_SIZE"])
+
+
+def clean_profile(data):
+    """Normalize submitted fields; returns (profile, error)."""
+    profile = {k: str(data.get(k) or "").strip() for k in ("name", "email", "role", "bio")}
+    sub = data.get("subscribe")
+    profile["subscribe"] = sub in (True, 1, "on", "true", "1")
+    if not profile["name"]:
+        return profile, "Name is required"
+    return profile, None
+
+
+def insert_profiles(profiles):
+    """Insert profiles in one transaction and return their new (id, token) pairs.
+
+    The token is a random, unguessable key for the profile's landing page.
+    """
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with pool.connection() as conn:
+        created = []
+        for p in profiles:
+            token = secrets.token_urlsafe(16)
+            cur = conn.execute(
+                "INSERT INTO profiles (name, email, role, bio, subscribe, created_at, token)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (p["name"], p["email"], p["role"], p["bio"], int(p["subscribe"]), now, token),
+            )
+            created.append((cur.lastrowid, token))
+    return created
+
+
+def row_to_dict(row, fields=PUBLIC_FIELDS):
+    data = {k: row[k] for k in fields}
+    data["subscribe"] = bool(data["subscribe"])
+    return data
+
+
+def get_profile(pid):
+    with pool.connection() as conn:
+        row = conn.execute("SELECT * FROM profiles WHERE id = ?", (pid,)).fetchone()
+    return row_to_dict(row) if row else None
+
+
+def get_profile_by_token(token):
+    with pool.connection() as conn:
+        row = conn.execute("SELECT * FROM profiles WHERE token = ?", (token,)).fetchone()
+    return row_to_dict(row, FIELDS) if row else None
+
+
+@lru_cache(maxsize=1024)
+def _render_cached(template, context_json):
+    return render_template(template, **json.loads(context_json))
+
+
+def render_cached(template, **context):
+    """``render_template`` memoized on its inputs.
+
+    Identical requests (e.g. the blank form) reuse the rendered HTML instead
+    of running Jinja again. Skipped in debug mode so template edits show up,
+    and for contexts over ``MAX_CACHED_CONTEXT`` bytes so the cache stays small.
+    """
+    if app.debug:
+        return render_template(template, **context)
+    context_json = json.dumps(context, sort_keys=True)
+    if len(context_json) > MAX_CACHED_CONTEXT:
+        return render_template(template, **context)
+    return _render_cached(template, context_json)
+
+
+def warm_templates():
+    """Compile every template up front so the first requests skip it."""
+    app.jinja_env.auto_reload = app.debug
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+
+def http_cache(max_age, private=False):
+    """Add Cache-Control and an ETag, answering 304 when the client's copy matches."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.cache_control.max_age = max_age
+                if private:
+                    response.cache_control.private = True
+                else:
+                    response.cache_control.public = True
+                response.add_etag()
+                response.make_conditional(request)
+            return response
+        return wrapper
+    return decorator
+
+
+@lru_cache(maxsize=64)
+def _load_asset(path):
+    data = Path(path).read_bytes()
+    return data, gzip.compress(data, compresslevel=9), hashlib.sha256(data).hexdigest()[:16]
+
+
+@app.get("/assets/<path:filename>")
+def asset(filename):
+    """Serve files from src/assets, gzip-compressed once and kept in memory."""
+    path = safe_join(str(ASSETS_DIR), filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    data, compressed, etag = _load_asset(path)
+    response = Response(mimetype=mimetypes.guess_type(path)[0] or "application/octet-stream")
+    response.vary.add("Accept-Encoding")
+    if "gzip" in request.accept_encodings and len(compressed) < len(data):
+        response.set_data(compressed)
+        response.content_encoding = "gzip"
+    else:
+        response.set_data(data)
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    response.set_etag(etag + ("-gz" if response.content_encoding else ""))
+    return response.make_conditional(request)
 
 
 @app.get("/")
+@http_cache(max_age=300)
 def home():
     """Render a simple profile form."""
     # Prefill from query args if present (optional UX)
@@ -15,44 +237,39 @@ def home():
         "bio": request.args.get("bio", ""),
         "subscribe": request.args.get("subscribe", "") == "on",
     }
-    return render_template("index.html", title="Profile Form", form=form, error=None)
+    return render_cached("index.html", title="Profile Form", form=form, error=None)
 
 
 @app.post("/submit")
 def submit():
-    """Handle form submission and redirect to landing page."""
-    name = request.form.get("name", "").strip()
-    email = request.form.get("email", "").strip()
-    role = request.form.get("role", "").strip()
-    bio = request.form.get("bio", "").strip()
-    subscribe = request.form.get("subscribe")  # 'on' if checked
-
-    if not name:
+    """Handle form submission, store the profile and redirect to its landing page."""
+    profile, error = clean_profile(request.form)  # subscribe is 'on' if checked
+
+    if error:
         form = dict(request.form)
         form["subscribe"] = bool(request.form.get("subscribe"))
         return render_template(
             "index.html",
             title="Profile Form",
             form=form,
-            error="Name is required",
+            error=error,
         ), 400
 
-    # PRG pattern: redirect with query string to avoid form resubmission
-    return redirect(
-        url_for(
-            "welcome",
-            name=name,
-            email=email,
-            role=role,
-            bio=bio,
-            subscribe="on" if subscribe else "",
-        )
-    )
+    # PRG pattern: redirect with the stored token to avoid form resubmission
+    ((_, token),) = insert_profiles([profile])
+    return redirect(url_for("welcome", token=token))
 
 
 @app.get("/welcome")
+@http_cache(max_age=3600, private=True)
 def welcome():
-    """Landing page that displays submitted information."""
+    """Landing page that displays a stored profile (or legacy query args)."""
+    token = request.args.get("token")
+    if token is not None:
+        data = get_profile_by_token(token)
+        if data is None:
+            abort(404)
+        return render_cached("welcome.html", title="Welcome", **data)
     data = {
         "name": request.args.get("name", ""),
         "email": request.args.get("email", ""),
@@ -60,7 +277,57 @@ def welcome():
         "bio": request.args.get("bio", ""),
         "subscribe": request.args.get("subscribe") == "on",
     }
-    return render_template("welcome.html", title="Welcome", **data)
+    return render_cached("welcome.html", title="Welcome", **data)
+
+
+@app.post("/api/profiles")
+def api_create_profiles():
+    """Create one profile (JSON object) or many at once (JSON array)."""
+    payload = request.get_json(silent=True)
+    items = payload if isinstance(payload, list) else [payload]
+    if not items or not all(isinstance(i, dict) for i in items):
+        return jsonify(error="Expected a JSON object or a non-empty array of objects"), 400
+    profiles = []
+    for n, item in enumerate(items):
+        profile, error = clean_profile(item)
+        if error:
+            return jsonify(error=f"Item {n}: {error}"), 400
+        profiles.append(profile)
+    ids = [pid for pid, _ in insert_profiles(profiles)]
+    if isinstance(payload, list):
+        return jsonify(ids=ids), 201
+    return jsonify(id=ids[0], **profiles[0]), 201, {"Location": url_for("api_get_profile", pid=ids[0])}
+
+
+@app.get("/api/profiles")
+def api_list_profiles():
+    """List profiles by ascending id, paginated with ?limit=N&after=<last id>.
+
+    Like ``GET /api/profiles/<id>``, items leave out the email address.
+    """
+    limit = min(max(request.args.get("limit", 50, type=int), 1), MAX_PAGE)
+    after = request.args.get("after", 0, type=int)
+    with pool.connection() as conn:
+        rows = conn.execute(
+            "SELECT * FROM profiles WHERE id > ? ORDER BY id LIMIT ?", (after, limit)
+        ).fetchall()
+    items = [row_to_dict(r) for r in rows]
+    next_after = items[-1]["id"] if len(items) == limit else None
+    return jsonify(items=items, next_after=next_after)
+
+
+@app.get("/api/profiles/<int:pid>")
+def api_get_profile(pid):
+    profile = get_profile(pid)
+    if profile is None:
+        return jsonify(error="Profile not found"), 404
+    return jsonify(profile)
+
+
+if os.getenv("ENABLE_METRICS") == "1":
+    from metrics import init_metrics
+
+    init_metrics(app)
 
 
 if __name__ == "__main__":
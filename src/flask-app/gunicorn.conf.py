@@ -0,0 +1,25 @@
+"""Production settings for serving the Flask demo with Gunicorn.
+
+Usage (from this directory):
+  gunicorn -c gunicorn.conf.py app:app
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "127.0.0.1:8000")
+# Threaded workers: each process handles several requests at once
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("WEB_THREADS", "4"))
+keepalive = 5
+timeout = 30
+# Logging every request would dominate the cost of these tiny pages
+accesslog = None
+errorlog = "-"
+
+
+def post_worker_init(worker):
+    # Compile templates once per worker instead of on first request
+    from app import warm_templates
+
+    warm_templates()
@@ -0,0 +1,124 @@
+"""Opt-in request instrumentation for the Flask demo.
+
+Records per-route latency, template render time and request/response sizes
+as histograms and serves them in the Prometheus text format on /metrics.
+Enable with ``ENABLE_METRICS=1`` (or ``init_metrics(app)``). Metrics live in
+process memory, so with several Gunicorn workers each one reports its own.
+"""
+import bisect
+import threading
+import time
+
+from flask import Response, g, request
+from flask.signals import before_render_template, template_rendered
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, as Prometheus expects."""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.series = {}  # labels tuple -> [bucket counts..., sum, count]
+
+    def observe(self, labels, value):
+        row = self.series.get(labels)
+        if row is None:
+            row = self.series[labels] = [0] * (len(self.buckets) + 2)
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.buckets):  # larger values only count towards +Inf
+            row[i] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, row in sorted(self.series.items()):
+            base = ",".join(f'{k}="{v}"' for k, v in labels)
+            sep = "," if base else ""
+            running = 0
+            for bound, n in zip(self.buckets, row):
+                running += n
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {running}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {row[-1]}')
+            lines.append(f"{self.name}_sum{{{base}}} {round(row[-2], 6)}")
+            lines.append(f"{self.name}_count{{{base}}} {row[-1]}")
+        return lines
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = Histogram("flask_request_duration_seconds", "Request latency by route.", LATENCY_BUCKETS)
+        self.render = Histogram("flask_template_render_seconds", "Jinja render time by template.", LATENCY_BUCKETS)
+        self.req_size = Histogram("flask_request_size_bytes", "Request body size by route.", SIZE_BUCKETS)
+        self.resp_size = Histogram("flask_response_size_bytes", "Response body size by route.", SIZE_BUCKETS)
+        self.requests = {}  # (route, method, status) -> count
+
+    def observe_request(self, route, method, status, seconds, req_bytes, resp_bytes):
+        labels = (("route", route), ("method", method))
+        with self.lock:
+            self.latency.observe(labels, seconds)
+            self.req_size.observe(labels, req_bytes)
+            self.resp_size.observe(labels, resp_bytes)
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def observe_render(self, template, seconds):
+        with self.lock:
+            self.render.observe((("template", template),), seconds)
+
+    def render_text(self):
+        with self.lock:
+            lines = ["# HELP flask_requests_total Requests by route, method and status.",
+                     "# TYPE flask_requests_total counter"]
+            for (route, method, status), n in sorted(self.requests.items()):
+                lines.append(f'flask_requests_total{{route="{route}",method="{method}",status="{status}"}} {n}')
+            for hist in (self.latency, self.render, self.req_size, self.resp_size):
+                lines.extend(hist.render())
+        return "\n".join(lines) + "\n"
+
+
+def init_metrics(app, path="/metrics"):
+    """Attach the instrumentation hooks and the metrics endpoint to ``app``."""
+    metrics = Metrics()
+    app.extensions["metrics"] = metrics
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None and request.endpoint != "metrics":
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            resp_bytes = response.content_length
+            if resp_bytes is None and not response.is_streamed:
+                resp_bytes = len(response.get_data())
+            metrics.observe_request(
+                route, request.method, response.status_code,
+                time.perf_counter() - start, request.content_length or 0, resp_bytes or 0,
+            )
+        return response
+
+    def _before_render(sender, template, context, **extra):
+        g.setdefault("_render_starts", []).append(time.perf_counter())
+
+    def _rendered(sender, template, context, **extra):
+        starts = g.get("_render_starts")
+        if starts:
+            metrics.observe_render(template.name or "<string>", time.perf_counter() - starts.pop())
+
+    before_render_template.connect(_before_render, app, weak=False)
+    template_rendered.connect(_rendered, app, weak=False)
+
+    @app.get(path, endpoint="metrics")
+    def _metrics():
+        return Response(metrics.render_text(), mimetype="text/plain; version=0.0.4")
+
+    return metrics
@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
 from datetime import date, timedelta
 from time import sleep
-from typing import Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 
-import pandas as pd
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.progress import Progress
 from rich.prompt import Prompt
 
+# pandas is only needed once prices arrive; import it lazily so the prompts
+# show up without waiting for it to load
+if TYPE_CHECKING:
+    import pandas as pd
+
 console = Console()
 
 
@@ -42,32 +46,96 @@ def download_prices(ticker: str, start: str, end: str) -> pd.DataFrame:
     return df
 
 
+TRADING_DAYS = 252
+
+
+def extract_close(df: pd.DataFrame, ticker: Optional[str] = None) -> pd.DataFrame:
+    """Return close prices as a wide frame with one column per ticker.
+
+    yfinance returns a (Price, Ticker) MultiIndex for one or many tickers, or
+    flat columns for older versions; both end up as a ticker-labelled panel.
+    """
+    import pandas as pd
+
+    close = df["Close"]
+    if isinstance(close, pd.Series):
+        close = close.to_frame(name=ticker or "Close")
+    return close.astype(float)
+
+
+def panel_returns(close: pd.DataFrame) -> pd.DataFrame:
+    """Simple returns per column against that column's previous valid price.
+
+    Gaps (e.g. a ticker listed later than the others) are skipped per column,
+    matching a ticker-by-ticker ``dropna().pct_change()``.
+    """
+    return close / close.ffill().shift(1) - 1.0
+
+
+def rolling_metrics(rets: pd.DataFrame, window: int = 21) -> pd.DataFrame:
+    """Annualized rolling return and volatility for every column.
+
+    Columns are a (stat, ticker) MultiIndex with stats "return" and "volatility".
+    """
+    import pandas as pd
+
+    roll = rets.rolling(window, min_periods=window)
+    return pd.concat(
+        {
+            "return": roll.mean() * TRADING_DAYS,
+            "volatility": roll.std() * TRADING_DAYS ** 0.5,
+        },
+        axis=1,
+    )
+
+
+def compute_panel_metrics(close: pd.DataFrame, window: int = 21) -> pd.DataFrame:
+    """Compute return/risk metrics for every column of a close-price panel at once.
+
+    Returns one row per ticker with observations, annualized return and
+    volatility, Sharpe (rf~0), maximum drawdown, and the latest annualized
+    return and volatility over a rolling ``window``.
+    """
+    import pandas as pd
+
+    rets = panel_returns(close)
+    ann_ret = rets.mean() * TRADING_DAYS
+    ann_vol = rets.std() * TRADING_DAYS ** 0.5
+
+    filled = close.ffill()
+    max_drawdown = (filled / filled.cummax() - 1.0).min()
+
+    # Latest available rolling value per ticker
+    latest = rolling_metrics(rets, window).ffill().iloc[-1]
+
+    return pd.DataFrame({
+        "observations": rets.count(),
+        "ann_return": ann_ret,
+        "ann_volatility": ann_vol,
+        "sharpe": ann_ret / ann_vol.where(ann_vol != 0),
+        "max_drawdown": max_drawdown,
+        "rolling_return": latest["return"],
+        "rolling_volatility": latest["volatility"],
+    })
+
+
 def compute_metrics(df: pd.DataFrame, ticker: str) -> Tuple[float, float, int]:
     """Return (annual_return, annual_volatility, observations) as floats.
 
     Handles yfinance returning MultiIndex columns by selecting the requested ticker
     or the first available column under "Close".
     """
-    close = df["Close"]
-    # If yfinance returns a DataFrame for df["Close"], pick the ticker column if present
-    if isinstance(close, pd.DataFrame):
-        if ticker in getattr(close, "columns", []):
-            close = close[ticker]
-        else:
-            close = close.iloc[:, 0]
-    close = close.dropna()
-
-    rets = close.pct_change().dropna()
-    n = int(len(rets))
+    close = extract_close(df, ticker)
+    stats = compute_panel_metrics(close[[ticker if ticker in close.columns else close.columns[0]]]).iloc[0]
+    n = int(stats["observations"])
     if n == 0:
         raise ValueError("Not enough data to compute returns.")
     # Convert to native floats to avoid pandas Series/NumPy scalar surprises
-    ann_ret = float(rets.mean()) * 252.0
-    ann_vol = float(rets.std()) * (252.0 ** 0.5)
-    return ann_ret, ann_vol, n
+    return float(stats["ann_return"]), float(stats["ann_volatility"]), n
 
 
-def render_summary(ticker: str, start: str, end: str, df: pd.DataFrame, ann_ret: float, ann_vol: float, n: int) -> None:
+def render_summary(ticker: str, start: str, end: str, close_series: pd.Series, stats: pd.Series,
+                   page: int = -1, page_size: int = 5) -> None:
     console.print(Panel.fit(f"[bold cyan]Market Data Summary[/] for [bold]{ticker}[/]"))
 
     # Metrics panel
@@ -76,51 +144,124 @@ def render_summary(ticker: str, start: str, end: str, df: pd.DataFrame, ann_ret:
     metrics.add_column(justify="left")
     # Use ASCII-only characters to avoid encoding issues on some terminals
     metrics.add_row("Period:", f"{start} to {end}")
-    metrics.add_row("Observations:", str(n))
-    metrics.add_row("Ann. Return:", f"{ann_ret*100:.2f}%")
-    metrics.add_row("Ann. Volatility:", f"{ann_vol*100:.2f}%")
-    # Simple Sharpe approximation (rf≈0)
-    sharpe = (ann_ret / ann_vol) if ann_vol else float("nan")
-    metrics.add_row("Sharpe (rf~0):", f"{sharpe:.2f}")
+    metrics.add_row("Observations:", str(int(stats["observations"])))
+    metrics.add_row("Ann. Return:", f"{stats['ann_return']*100:.2f}%")
+    metrics.add_row("Ann. Volatility:", f"{stats['ann_volatility']*100:.2f}%")
+    # Simple Sharpe approximation (rf~0)
+    metrics.add_row("Sharpe (rf~0):", f"{stats['sharpe']:.2f}")
+    metrics.add_row("Max Drawdown:", f"{stats['max_drawdown']*100:.2f}%")
+    metrics.add_row("Rolling Vol (21d):", f"{stats['rolling_volatility']*100:.2f}%")
     console.print(Panel(metrics, title="Metrics", expand=False))
 
-    # Sample prices (robust to yfinance multi-ticker frames)
-    tbl = Table(title="Sample closing prices (last 5)")
-    tbl.add_column("Date")
-    tbl.add_column("Close", justify="right")
-
-    # Prefer the selected ticker if df["Close"] is a DataFrame, else use the Series
-    close_col = df.get("Close") if hasattr(df, "get") else df["Close"]
-    if isinstance(close_col, pd.DataFrame):
-        if ticker in close_col.columns:
-            close_series = close_col[ticker]
-        else:
-            # Fallback to the first available column
-            close_series = close_col.iloc[:, 0]
-    else:
-        close_series = close_col
-
-    tail_series = close_series.dropna().tail(5)
-    for idx, val in tail_series.items():
-        ts = idx.strftime("%Y-%m-%d") if hasattr(idx, "strftime") else str(idx)
+    console.print(PricePager(close_series, page_size).table(page))
+
+
+class PricePager:
+    """Page through a close-price series, formatting only the visible rows.
+
+    Missing values are dropped once up front; after that each page is an
+    ``iloc`` slice whose dates and prices are formatted in one vectorized call,
+    so rendering cost depends on ``page_size`` rather than the history length.
+    Pages are 1-based and negative numbers count from the end (-1 = latest).
+    """
+
+    def __init__(self, close_series: pd.Series, page_size: int = 20):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.series = close_series.dropna()
+        self.page_size = page_size
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-len(self.series) // self.page_size))
+
+    def normalize(self, page: int) -> int:
+        """Clamp a 1-based or negative page number into 1..pages."""
+        if page < 0:
+            page += self.pages + 1
+        return min(max(page, 1), self.pages)
+
+    def bounds(self, page: int) -> Tuple[int, int]:
+        """Row range [lo, hi) of a page; the last page is kept full."""
+        n = len(self.series)
+        lo = min((self.normalize(page) - 1) * self.page_size, max(n - self.page_size, 0))
+        return lo, min(lo + self.page_size, n)
+
+    def rows(self, page: int) -> Tuple[list, list]:
+        """Formatted (dates, closes) of one page."""
+        import numpy as np
+
+        lo, hi = self.bounds(page)
+        window = self.series.iloc[lo:hi]
+        index = window.index
+        dates = index.strftime("%Y-%m-%d") if hasattr(index, "strftime") else index.astype(str)
+        closes = np.char.mod("%.2f", window.to_numpy(dtype=float))
+        return list(dates), closes.tolist()
+
+    def table(self, page: int) -> Table:
+        page = self.normalize(page)
+        lo, hi = self.bounds(page)
+        tbl = Table(
+            title="Closing prices",
+            caption=f"page {page}/{self.pages}, rows {lo + 1 if hi else 0}-{hi} of {len(self.series)}",
+        )
+        tbl.add_column("Date")
+        tbl.add_column("Close", justify="right")
+        for ts, close in zip(*self.rows(page)):
+            tbl.add_row(ts, close)
+        return tbl
+
+
+def browse(pager: PricePager, page: int = -1) -> None:
+    """Interactive paging: n(ext), p(rev), f(irst), l(ast), a page number, q(uit)."""
+    page = pager.normalize(page)
+    while True:
+        console.print(pager.table(page))
+        choice = Prompt.ask("[dim]n/p/f/l, page number or q[/]", default="q").strip().lower()
+        if choice == "q":
+            return
         try:
-            num = float(val)
-        except Exception:
-            num = val
-        tbl.add_row(ts, f"{num:.2f}" if isinstance(num, float) else str(num))
-    console.print(tbl)
+            page = pager.normalize(int(choice))
+        except ValueError:
+            page = {
+                "n": min(page + 1, pager.pages),
+                "p": max(page - 1, 1),
+                "f": 1,
+                "l": pager.pages,
+            }.get(choice, page)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rich market data mini-app")
+    parser.add_argument("--page", type=int, default=-1,
+                        help="Page of the closing-price table to show (1-based; -1 = latest)")
+    parser.add_argument("--page-size", type=int, default=5, help="Rows per page")
+    parser.add_argument("--browse", action="store_true",
+                        help="Page through the price table interactively after the summary")
+    args = parser.parse_args(argv)
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    return args
 
 
-def main() -> None:
+def main(argv=None) -> None:
+    args = parse_args(argv)
     console.print(Panel.fit("[bold cyan]Rich[/] demo: pick a ticker, fetch prices, compute [green]annual return[/] and [yellow]volatility[/]."))
     ticker, start, end = pick_inputs()
     try:
         df = download_prices(ticker, start, end)
-        ann_ret, ann_vol, n = compute_metrics(df, ticker)
+        # Extract closes once and share them between metrics and rendering
+        close = extract_close(df, ticker)
+        col = ticker if ticker in close.columns else close.columns[0]
+        stats = compute_panel_metrics(close).loc[col]
+        if stats["observations"] == 0:
+            raise ValueError("Not enough data to compute returns.")
     except Exception as e:
         console.print(f"[red]Error:[/] {e}")
         return
-    render_summary(ticker, start, end, df, ann_ret, ann_vol, n)
+    render_summary(ticker, start, end, close[col], stats, args.page, args.page_size)
+    if args.browse:
+        browse(PricePager(close[col], args.page_size), args.page)
 
 
 if __name__ == "__main__":
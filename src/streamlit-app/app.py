@@ -1,16 +1,149 @@
 #!/usr/bin/env python3
+import zlib
+from datetime import date, timedelta
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 
+TICKERS = ["AAPL", "MSFT", "GOOG", "AMZN", "NVDA"]
+SOURCES = ["Synthetic", "Yahoo Finance"]
+# Bar size -> (pandas frequency for synthetic data, bars per year)
+BAR_SIZES = {"1d": ("B", 252), "1h": ("h", 252 * 7), "1m": ("min", 252 * 390)}
+
 st.set_page_config(page_title="Streamlit Demo", layout="centered")
 st.title("Streamlit UI Demo")
 name = st.text_input("Name", value="World")
 if st.button("Greet"):
     st.success(f"Hello {name}")
 
-st.subheader("Random Chart")
-st.line_chart(pd.DataFrame(np.random.randn(30, 3), columns=list("ABC")))
+
+# Streamlit re-runs this whole script on every interaction. The cached
+# functions below only execute again when their arguments change (or the TTL
+# expires), so typing a name or pressing Greet never reloads prices.
+@st.cache_data(ttl=3600, max_entries=32, show_spinner="Loading prices...")
+def load_prices(tickers: tuple, start: date, end: date, source: str, bar: str = "1d") -> pd.DataFrame:
+    """Close prices with one column per ticker, cached per set of inputs for an hour."""
+    if source == "Yahoo Finance":
+        import yfinance as yf
+
+        df = yf.download(list(tickers), start=start, end=end, interval=bar, auto_adjust=True, progress=False)
+        if df.empty:
+            return pd.DataFrame()
+        close = df["Close"]
+        if isinstance(close, pd.Series):
+            close = close.to_frame(name=tickers[0])
+        return close[list(tickers)].dropna(how="all")
+
+    # Offline data: a reproducible random walk per ticker, in trading hours
+    freq, per_year = BAR_SIZES[bar]
+    idx = pd.date_range(start, end, freq=freq, inclusive="left", name="Date")
+    if bar != "1d":
+        idx = idx[idx.dayofweek < 5]
+        idx = idx[idx.indexer_between_time("09:30", "15:59")]
+    data = {}
+    for t in tickers:
+        rng = np.random.default_rng(zlib.crc32(t.encode()))
+        data[t] = 100 * np.exp(np.cumsum(rng.normal(0.08 / per_year, 0.25 / per_year ** 0.5, len(idx))))
+    return pd.DataFrame(data, index=idx)
+
+
+def downsample_minmax(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """Reduce ``df`` to roughly ``max_points`` rows while keeping its shape.
+
+    Rows are split into equal-width buckets; for every column the rows holding
+    the bucket's minimum and maximum are kept, plus the first and last row, so
+    spikes survive while the browser only receives a few thousand points.
+    """
+    n = len(df)
+    if n <= max_points:
+        return df
+    buckets = max(max_points // (2 * max(df.shape[1], 1)), 1)
+    bucket = np.arange(n) * buckets // n
+    starts = np.searchsorted(bucket, np.arange(buckets))
+    ends = np.r_[starts[1:], n] - 1
+    keep = [np.array([0, n - 1])]
+    for col in df.to_numpy(dtype=float).T:
+        # Sort by bucket, then value: each bucket's first row is its min, last its max
+        keep.append(np.lexsort((np.where(np.isnan(col), np.inf, col), bucket))[starts])
+        keep.append(np.lexsort((np.where(np.isnan(col), -np.inf, col), bucket))[ends])
+    return df.iloc[np.unique(np.concatenate(keep))]
+
+
+@st.cache_data(ttl=3600, max_entries=64)
+def chart_data(tickers: tuple, start: date, end: date, source: str, bar: str,
+               window: tuple, max_points: int) -> pd.DataFrame:
+    """Visible slice of the cached prices, downsampled for plotting.
+
+    Keyed on the small inputs rather than the frame itself, so a cache hit
+    costs no hashing of the full history.
+    """
+    close = load_prices(tickers, start, end, source, bar)
+    # Binary search on the sorted index instead of a boolean mask over all rows
+    lo = close.index.searchsorted(pd.Timestamp(window[0]))
+    hi = close.index.searchsorted(pd.Timestamp(window[1]), side="right")
+    return downsample_minmax(close.iloc[lo:hi], max_points)
+
+
+@st.cache_data(ttl=3600, max_entries=64)
+def compute_metrics(tickers: tuple, start: date, end: date, source: str, bar: str) -> pd.DataFrame:
+    """Annualized return/volatility, Sharpe (rf~0) and max drawdown per ticker.
+
+    Keyed like ``chart_data``, so reruns never hash the price frame.
+    """
+    close = load_prices(tickers, start, end, source, bar)
+    per_year = BAR_SIZES[bar][1]
+    rets = close / close.ffill().shift(1) - 1.0
+    ann_ret = rets.mean() * per_year
+    ann_vol = rets.std() * per_year ** 0.5
+    filled = close.ffill()
+    return pd.DataFrame({
+        "Ann. Return": ann_ret,
+        "Ann. Volatility": ann_vol,
+        "Sharpe": ann_ret / ann_vol.where(ann_vol != 0),
+        "Max Drawdown": (filled / filled.cummax() - 1.0).min(),
+    })
+
 
 with st.sidebar:
     st.info("Use the sidebar for settings")
+    tickers = st.multiselect("Tickers", TICKERS, default=TICKERS[:3])
+    today = date.today()
+    start = st.date_input("Start", value=today - timedelta(days=365))
+    end = st.date_input("End", value=today)
+    source = st.radio("Data source", SOURCES, help="Synthetic data works offline")
+    bar = st.selectbox("Bar size", list(BAR_SIZES), help="Yahoo only serves recent intraday history")
+    max_points = st.number_input("Max chart points", min_value=200, max_value=20_000, value=2_000, step=500)
+    if st.button("Clear cached data"):
+        st.cache_data.clear()
+
+st.subheader("Prices")
+if not tickers:
+    st.warning("Pick at least one ticker in the sidebar.")
+elif start >= end:
+    st.warning("Start must be before end.")
+else:
+    try:
+        close = load_prices(tuple(tickers), start, end, source, bar)
+    except Exception as e:
+        st.error(f"Could not load prices: {e}")
+        close = pd.DataFrame()
+    if close.empty:
+        st.warning("No data returned; check tickers and dates.")
+    else:
+        first, last = close.index[0].to_pydatetime(), close.index[-1].to_pydatetime()
+        window = (first, last)
+        if first < last:
+            window = st.slider("Zoom", min_value=first, max_value=last, value=(first, last), format="YYYY-MM-DD HH:mm")
+        shown = chart_data(tuple(tickers), start, end, source, bar, window, int(max_points))
+        st.line_chart(shown)
+        st.caption(f"Showing {len(shown):,} of {len(close):,} bars")
+        st.subheader("Metrics")
+        st.dataframe(
+            compute_metrics(tuple(tickers), start, end, source, bar).style.format({
+                "Ann. Return": "{:.2%}",
+                "Ann. Volatility": "{:.2%}",
+                "Sharpe": "{:.2f}",
+                "Max Drawdown": "{:.2%}",
+            })
+        )
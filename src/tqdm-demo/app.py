@@ -1,14 +1,64 @@
 #!/usr/bin/env python3
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Queue
 from time import sleep
 from tqdm import tqdm
 
-# Basic iteration
-for i in tqdm(range(200), desc="Loop"):
-    sleep(0.005)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+from batched_progress import BatchedProgress, QueueReporter  # noqa: E402
 
-# Manual mode
-from tqdm import tqdm as tq
-with tq(total=50, desc="Manual") as bar:
-    for _ in range(10):
-        sleep(0.02)
-        bar.update(5)
+STEPS = 5_000_000
+WORKERS = 4
+
+_reporter = None
+
+
+def _init_worker(queue):
+    global _reporter
+    _reporter = QueueReporter(queue)
+
+
+def _work(steps):
+    # Many tiny steps, each reported to the parent bar in batches
+    update = _reporter.update
+    acc = 0
+    for i in range(steps):
+        acc += i & 7
+        update()
+    _reporter.flush()
+    return acc
+
+
+def main():
+    # Basic iteration
+    for i in tqdm(range(200), desc="Loop"):
+        sleep(0.005)
+
+    # Manual mode
+    from tqdm import tqdm as tq
+    with tq(total=50, desc="Manual") as bar:
+        for _ in range(10):
+            sleep(0.02)
+            bar.update(5)
+
+    # Millions of tiny steps: the bar is only redrawn about every 0.1s
+    with BatchedProgress(total=STEPS, desc="Batched") as bar:
+        for _ in range(STEPS):
+            bar.update()
+
+    # Unknown total: rate-only counter
+    with BatchedProgress(desc="Stream") as bar:
+        for _ in bar.track(i for i in range(STEPS)):
+            pass
+
+    # Several processes feeding a single bar through a queue
+    share = STEPS // WORKERS
+    with BatchedProgress(total=share * WORKERS, desc="Workers") as bar, bar.listen(Queue()) as queue:
+        with ProcessPoolExecutor(WORKERS, initializer=_init_worker, initargs=(queue,)) as pool:
+            list(pool.map(_work, [share] * WORKERS))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,867 @@
 #!/usr/bin/env python3
+import ast
+import hashlib
+import json
+import os
+import pickle
 import sys
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
 import click
 
 try:
     import yfinance as yf
 except Exception as e:
     raise SystemExit("This tool requires the 'yfinance' package. Install it with: pip install yfinance")
+import numpy as np
+import pandas as pd
+
+# Shared helpers from src/common, imported where they are used
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "common"))
+
 
 def function(arg1, arg2, arg3, keyword=True):
     pass
 
+# Approximate calendar length of each --period choice; "max" has no fixed start
+PERIOD_DAYS = {
+    "1d": 1, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183,
+    "1y": 366, "2y": 731, "5y": 1827, "10y": 3653,
+}
+
+# Formats that cannot be streamed to stdout and always use flat, typed columns
+BINARY_FORMATS = ("parquet", "feather", "npy")
+
+# Rows rendered to text at a time when writing output
+CHUNK_ROWS = 50_000
+
+# Pandas rule for resampling bars to each --interval; bins are labelled by
+# their start like Yahoo's own bars, with weeks starting on Monday
+RESAMPLE_RULES = {
+    "1m": "1min", "2m": "2min", "5m": "5min", "15m": "15min", "30m": "30min",
+    "60m": "60min", "90m": "90min", "1h": "60min", "1d": "1D", "5d": "5D",
+    "1wk": "W-MON", "1mo": "MS", "3mo": "QS",
+}
+
+# Shortest calendar length of a bar per interval, used to order intervals and
+# to recognise the interval of bars loaded from a file
+INTERVAL_SECONDS = {
+    "1m": 60, "2m": 120, "5m": 300, "15m": 900, "30m": 1800, "60m": 3600,
+    "90m": 5400, "1h": 3600, "1d": 86400, "5d": 5 * 86400, "1wk": 7 * 86400,
+    "1mo": 28 * 86400, "3mo": 89 * 86400,
+}
+
+# Bars per year used to annualize statistics of daily and coarser bars
+PERIODS_PER_YEAR = {"1d": 252, "5d": 252 / 5, "1wk": 52, "1mo": 12, "3mo": 4}
+
+# Intervals served from cached daily bars instead of their own download
+LOCAL_INTERVALS = ("5d", "1wk", "1mo", "3mo")
+
+# How each price field combines when bars are merged; others keep the last value
+OHLCV_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+DEFAULT_CACHE_DIR = os.getenv("TESTER_CACHE_DIR", str(Path.home() / ".cache" / "tester"))
+
+# Phases reported by --timings, in pipeline order
+PHASES = ("parse", "fetch", "compute", "serialize", "write")
+
+# perf_counter() when run as a script, before click parses argv
+_INVOKED = None
+
+
+def period_to_range(period, today=None):
+    """Translate a --period choice into a (start, end) date range, end exclusive.
+
+    Returns None for "max", which cannot be expressed as a bounded range.
+    """
+    today = today or date.today()
+    end = today + timedelta(days=1)
+    if period == "ytd":
+        return date(today.year, 1, 1), end
+    if period in PERIOD_DAYS:
+        return today - timedelta(days=PERIOD_DAYS[period]), end
+    return None
+
+
+class PhaseTimer:
+    """Wall time spent in each phase of a run, printed by ``--timings``.
+
+    A phase can be entered many times and from several threads; its times
+    add up. A disabled timer skips the clock calls, so the phases stay
+    marked in the code at next to no cost.
+    """
+
+    def __init__(self, enabled=True, started=None):
+        self.enabled = enabled
+        self.started = started if started is not None else time.perf_counter()
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        if self.enabled:
+            with self._lock:
+                self.totals[name] = self.totals.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def timed(self, name, iterable):
+        """Yield from ``iterable``, charging the time to produce each item to ``name``."""
+        it = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+            yield item
+
+    def report(self):
+        if not self.enabled:
+            return
+        wall = time.perf_counter() - self.started
+        lines = [f"{'phase':<10} {'seconds':>9} {'share':>7}"]
+        for name, secs in [*self.totals.items(), ("other", wall - sum(self.totals.values()))]:
+            lines.append(f"{name:<10} {secs:9.3f} {secs / wall if wall else 0:7.1%}")
+        lines.append(f"{'total':<10} {wall:9.3f}")
+        click.echo("\n".join(lines), err=True)
+
+
+def yahoo_fetcher(ticker, start, end, interval, adjust):
+    """Download bars for [start, end) from Yahoo Finance."""
+    return yf.download(
+        tickers=ticker,
+        start=start.isoformat(),
+        end=end.isoformat(),
+        interval=interval,
+        auto_adjust=adjust,
+        progress=False,
+        threads=False,
+    )
+
+
+class RunningStats:
+    """Online statistics of a close-price series, updated in O(new bars).
+
+    Keeps Welford's running mean and sum of squared deviations of simple
+    returns, plus the running peak and maximum drawdown, so appending a day
+    of bars never requires a pass over the full history. The state is a
+    small JSON-serializable dict that ``PriceCache`` stores with each entry.
+    """
+
+    FIELDS = ("count", "mean", "m2", "last_price", "peak", "max_drawdown", "first_ts", "last_ts")
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, last_price=None, peak=None,
+                 max_drawdown=0.0, first_ts=None, last_ts=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.last_price = last_price
+        self.peak = peak
+        self.max_drawdown = max_drawdown
+        self.first_ts = first_ts
+        self.last_ts = last_ts
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{k: data[k] for k in cls.FIELDS if k in data})
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.FIELDS}
+
+    def push(self, ts, price):
+        """Consume one bar."""
+        price = float(price)
+        if self.last_price is not None and self.last_price != 0:
+            ret = price / self.last_price - 1.0
+            self.count += 1
+            delta = ret - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (ret - self.mean)
+        self.peak = price if self.peak is None else max(self.peak, price)
+        if self.peak:
+            self.max_drawdown = min(self.max_drawdown, price / self.peak - 1.0)
+        self.last_price = price
+        self.first_ts = self.first_ts or ts
+        self.last_ts = ts
+
+    def update(self, closes, before=None):
+        """Consume the bars of ``closes`` newer than the last one seen.
+
+        Bars dated on or after ``before`` are skipped because they may still
+        change (e.g. today's bar during market hours).
+        """
+        closes = closes.dropna()
+        if self.last_ts is not None:
+            pos = closes.index.searchsorted(pd.Timestamp(self.last_ts), side="right")
+            closes = closes.iloc[pos:]
+        if before is not None:
+            closes = closes[closes.index.date < before]
+        for ts, price in closes.items():
+            self.push(ts.isoformat(), price)
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    def annualized(self, periods_per_year=252):
+        """Return (annual_return, annual_volatility) from per-bar returns."""
+        return self.mean * periods_per_year, (self.variance * periods_per_year) ** 0.5
+
+
+def close_series(df):
+    """Return the close prices of a single-ticker yfinance frame as a Series."""
+    close = df["Close"]
+    return close.iloc[:, 0] if isinstance(close, pd.DataFrame) else close
+
+
+def _field(column):
+    """Price field of a plain or (Price, Ticker) column label."""
+    return column[0] if isinstance(column, tuple) else column
+
+
+def resample_ohlcv(df, rule):
+    """Aggregate bars into ``rule`` bins (open first, high max, low min,
+    close last, volume summed), dropping bins without any price."""
+    bins = df.resample(rule, closed="left", label="left")
+    out = bins.agg({col: OHLCV_AGG.get(_field(col), "last") for col in df.columns})
+    out = out[df.columns]
+    prices = [col for col in df.columns if _field(col) != "Volume"]
+    return out.dropna(how="all", subset=prices) if prices else out
+
+
+def infer_interval(index):
+    """Return the --interval whose bars are spaced like ``index`` (by median gap)."""
+    if len(index) < 2:
+        return "1d"
+    gap = pd.Series(index).diff().median().total_seconds()
+    fits = [name for name, secs in INTERVAL_SECONDS.items() if secs <= gap * 1.01 and name != "60m"]
+    return max(fits, key=INTERVAL_SECONDS.get) if fits else "1m"
+
+
+class BarStore:
+    """Bars of one ticker indexed by time for range queries and resampling.
+
+    The bars are kept once at their native ``interval``, sorted and without
+    duplicate timestamps, next to a datetime64 array of their timestamps.
+    ``slice`` binary-searches that array, so a date-range query costs
+    O(log n) plus the rows returned instead of a mask over the whole frame.
+    ``resample`` aggregates to any coarser interval and keeps the result as
+    another store, so repeated queries on, say, weekly bars are slices too.
+
+    Columns are left as given, so yfinance (Price, Ticker) frames round-trip.
+    Naive query bounds are read in the index's time zone.
+    """
+
+    def __init__(self, df, interval="1d"):
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("Bars need a DatetimeIndex")
+        if len(file_tickers(df)) > 1:
+            # Deduplicating dates would mix the tickers' bars
+            raise ValueError("Bars hold several tickers; pick one with select_ticker")
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index(kind="stable")
+        if not df.index.is_unique:
+            df = df[~df.index.duplicated(keep="last")]
+        self.frame = df
+        self.interval = interval
+        self.tz = df.index.tz
+        # Tz-aware indexes convert to UTC, matching _key
+        self.ts = df.index.to_numpy(dtype="datetime64[ns]")
+        self._views = {interval: self}
+
+    @classmethod
+    def from_file(cls, path, interval=None, ticker=None):
+        """Load bars with ``read_bars_file``; the interval is inferred if not given.
+
+        Files holding several tickers are narrowed to ``ticker`` by
+        ``select_ticker``.
+        """
+        df, _ = select_ticker(read_bars_file(path), ticker)
+        return cls(df, interval or infer_interval(df.index))
+
+    def __len__(self):
+        return len(self.ts)
+
+    def _key(self, when):
+        ts = pd.Timestamp(when)
+        if self.tz is not None:
+            ts = ts.tz_localize(self.tz) if ts.tzinfo is None else ts.tz_convert(self.tz)
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        elif ts.tzinfo is not None:
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        return np.datetime64(ts.value, "ns")
+
+    def bounds(self, start=None, end=None):
+        """Row positions [lo, hi) of the bars with start <= time < end."""
+        lo = 0 if start is None else int(np.searchsorted(self.ts, self._key(start), "left"))
+        hi = len(self.ts) if end is None else int(np.searchsorted(self.ts, self._key(end), "left"))
+        return lo, max(lo, hi)
+
+    def slice(self, start=None, end=None):
+        """Bars with start <= time < end; either bound may be omitted."""
+        lo, hi = self.bounds(start, end)
+        return self.frame.iloc[lo:hi]
+
+    def resample(self, interval):
+        """Return a store of these bars aggregated to a coarser ``interval``."""
+        if interval not in self._views:
+            if interval not in RESAMPLE_RULES:
+                raise ValueError(f"Unknown interval: {interval}")
+            if INTERVAL_SECONDS[interval] < INTERVAL_SECONDS[self.interval]:
+                raise ValueError(f"Cannot resample {self.interval} bars to the finer interval {interval}")
+            bars = resample_ohlcv(self.frame, RESAMPLE_RULES[interval])
+            self._views[interval] = BarStore(bars, interval)
+        return self._views[interval]
+
+    def query(self, start=None, end=None, interval=None):
+        """Bars in [start, end), resampled to ``interval`` when it is given."""
+        store = self if interval in (None, self.interval) else self.resample(interval)
+        return store.slice(start, end)
+
+
+class PriceCache:
+    """Persistent on-disk cache of downloaded bars.
+
+    Each (ticker, interval, adjust) combination is stored under the SHA-256 of
+    its key as a pickled DataFrame plus a small JSON metadata file recording
+    the covered date range. Later requests only fetch the dates outside that
+    range, so a daily refresh becomes a tail fetch. The ``fetcher`` is any
+    callable with the signature of ``yahoo_fetcher``, which makes it easy to
+    swap Yahoo for a local stand-in (``benchmarks/price_cache.py`` uses one).
+    Like Yahoo, a stand-in must return the same close for a date whatever
+    range is requested, or every incremental fetch triggers a rebuild.
+
+    Entries not accessed for ``ttl`` seconds, and the least recently used
+    entries beyond ``max_bytes`` in total, are evicted after each lookup.
+
+    Each entry also carries ``RunningStats`` over its closes, advanced only
+    by newly appended bars (see ``stats``).
+
+    Every incremental fetch re-fetches one already cached bar. If its close
+    changed, e.g. because Yahoo back-adjusted the history for a dividend or
+    split, the entry and its statistics are rebuilt from a full fetch.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, fetcher=yahoo_fetcher, ttl=None, max_bytes=None):
+        self.root = Path(root)
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(ticker, interval, adjust):
+        raw = f"{ticker.upper()}|{interval}|{int(bool(adjust))}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _paths(self, key):
+        return self.root / f"{key}.pkl", self.root / f"{key}.json"
+
+    def _read_meta(self, key):
+        _, meta_path = self._paths(key)
+        try:
+            return json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key, df, meta):
+        """Persist an entry; pass ``df=None`` to refresh only its metadata."""
+        data_path, meta_path = self._paths(key)
+        # Write to temporary files first so readers never see a partial entry
+        if df is not None:
+            tmp_data = data_path.with_suffix(".pkl.tmp")
+            df.to_pickle(tmp_data)
+            os.replace(tmp_data, data_path)
+            meta["bytes"] = data_path.stat().st_size
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        tmp_meta.write_text(json.dumps(meta))
+        os.replace(tmp_meta, meta_path)
+
+    @staticmethod
+    def missing_ranges(start, end, meta):
+        """Return the [start, end) ranges not covered by a cached entry.
+
+        The cached coverage is kept contiguous, so a request that lies entirely
+        outside it also fetches the gap in between.
+        """
+        if meta is None:
+            return [(start, end)]
+        cs = date.fromisoformat(meta["start"])
+        ce = date.fromisoformat(meta["end"])
+        ranges = []
+        if start < cs:
+            ranges.append((start, cs))
+        if end > ce:
+            ranges.append((ce, end))
+        return ranges
+
+    def get(self, ticker, start, end, interval="1d", adjust=True, today=None):
+        """Return bars for [start, end), fetching only what the cache lacks."""
+        today = today or date.today()
+        key = self.key(ticker, interval, adjust)
+        data_path, _ = self._paths(key)
+        meta = self._read_meta(key)
+        cached = None
+        if meta is not None:
+            try:
+                cached = pd.read_pickle(data_path)
+            except (OSError, ValueError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+                # Corrupt or written by incompatible library versions: a miss
+                meta = None
+
+        frames = [cached] if cached is not None else []
+        cs = date.fromisoformat(meta["start"]) if meta else None
+        ce = date.fromisoformat(meta["end"]) if meta else None
+        # Bars inside the covered range are final; a later one (today's) may still move
+        settled = BarStore(cached, interval).slice(cs, ce) if cached is not None and not cached.empty else None
+        fetched = False
+        for lo, hi in self.missing_ranges(start, end, meta):
+            if settled is not None and not settled.empty:
+                # Re-fetch one cached bar next to the gap: auto-adjusted prices
+                # are rewritten after every dividend or split, and only an
+                # overlapping bar shows that the stored history went stale
+                if lo >= ce:
+                    lo = min(lo, settled.index[-1].date())
+                else:
+                    hi = max(hi, settled.index[0].date() + timedelta(days=1))
+            part = self.fetcher(ticker, lo, hi, interval, adjust)
+            # An empty answer may be a holiday or a failed request, so the
+            # range stays uncovered and is retried next time
+            if part is None or part.empty:
+                continue
+            if settled is not None and self.diverged(settled, part):
+                return self._rebuild(ticker, min(start, cs), max(end, ce), interval, adjust, today, start, end)
+            frames.append(part)
+            fetched = True
+            cs = lo if cs is None else min(cs, lo)
+            ce = hi if ce is None else max(ce, hi)
+
+        if not frames:
+            return pd.DataFrame()
+        if fetched:
+            cached = pd.concat(frames)
+            cached = cached[~cached.index.duplicated(keep="last")].sort_index()
+            # Appended bars extend the stored statistics; older bars prepended
+            # before the covered range require a rebuild
+            if meta and meta.get("stats") and cs >= date.fromisoformat(meta["start"]):
+                stats = RunningStats.from_dict(meta["stats"])
+            else:
+                stats = RunningStats()
+            stats.update(close_series(cached), before=today)
+            meta = {
+                "ticker": ticker.upper(),
+                "interval": interval,
+                "adjust": bool(adjust),
+                "start": cs.isoformat(),
+                # Today's bar may still change, so never mark it as covered
+                "end": max(min(ce, today), cs).isoformat(),
+                "created": meta["created"] if meta else time.time(),
+                "stats": stats.to_dict(),
+            }
+        meta["accessed"] = time.time()
+        self._write(key, cached if fetched else None, meta)
+        self.evict()
+
+        return BarStore(cached, interval).slice(start, end)
+
+    @staticmethod
+    def diverged(cached, part, rtol=1e-6):
+        """True if bars present in both frames disagree on the close."""
+        common = cached.index.intersection(part.index)
+        if common.empty:
+            return False
+        old = close_series(cached).reindex(common).to_numpy(dtype=float)
+        new = close_series(part).reindex(common).to_numpy(dtype=float)
+        return not np.allclose(old, new, rtol=rtol, equal_nan=True)
+
+    def _rebuild(self, ticker, lo, hi, interval, adjust, today, start, end):
+        """Drop a stale entry, fetch [lo, hi) again (stats included) and return [start, end)."""
+        self.remove(self.key(ticker, interval, adjust))
+        bars = self.get(ticker, lo, hi, interval, adjust, today)
+        return BarStore(bars, interval).slice(start, end) if not bars.empty else bars
+
+    def stats(self, ticker, interval="1d", adjust=True):
+        """Return the stored ``RunningStats`` for an entry, or None if not cached."""
+        meta = self._read_meta(self.key(ticker, interval, adjust))
+        if meta is None or "stats" not in meta:
+            return None
+        return RunningStats.from_dict(meta["stats"])
+
+    def entries(self):
+        """Yield (key, meta) for every entry currently in the cache."""
+        for meta_path in self.root.glob("*.json"):
+            meta = self._read_meta(meta_path.stem)
+            if meta is not None:
+                yield meta_path.stem, meta
+
+    def remove(self, key):
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def evict(self, now=None):
+        """Drop expired entries, then least recently used ones over the size limit."""
+        if self.ttl is None and self.max_bytes is None:
+            return []
+        now = now or time.time()
+        entries = sorted(self.entries(), key=lambda kv: kv[1].get("accessed", 0))
+        removed = []
+        if self.ttl is not None:
+            for key, meta in entries:
+                if now - meta.get("accessed", 0) > self.ttl:
+                    self.remove(key)
+                    removed.append(key)
+        if self.max_bytes is not None:
+            live = [(k, m) for k, m in entries if k not in removed]
+            total = sum(m.get("bytes", 0) for _, m in live)
+            for key, meta in live:
+                if total <= self.max_bytes:
+                    break
+                self.remove(key)
+                removed.append(key)
+                total -= meta.get("bytes", 0)
+        return removed
+
+def read_tickers(path):
+    """Read tickers from a file: whitespace/comma separated, '#' starts a comment."""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    with stream:
+        tickers = []
+        for line in stream:
+            line = line.split("#", 1)[0]
+            tickers.extend(t for t in line.replace(",", " ").split() if t)
+    return tickers
+
+
+def fetch_with_retry(fetch, ticker, retries=2, backoff=1.0):
+    """Call ``fetch(ticker)``, retrying with exponential backoff.
+
+    Empty results are retried as well since Yahoo answers transient failures
+    with an empty frame. Raises the last error once retries are exhausted.
+    """
+    for attempt in range(retries + 1):
+        try:
+            df = fetch(ticker)
+            if df is not None and not df.empty:
+                return df
+            error = ValueError("No data returned. Check the ticker, dates, or interval.")
+        except Exception as e:
+            error = e
+        if attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+    raise error
+
+
+def download_many(tickers, fetch, workers=8, retries=2, backoff=1.0, on_done=None):
+    """Fetch many tickers through a bounded thread pool.
+
+    A failing ticker never affects the others. Returns ``(frames, failures)``,
+    both dicts keyed by ticker and ordered like ``tickers``. ``on_done`` is
+    called as ``on_done(ticker, error)`` when each ticker finishes.
+    """
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(fetch_with_retry, fetch, t, retries, backoff): t for t in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results[ticker] = future.result()
+                error = None
+            except Exception as e:
+                errors[ticker] = error = e
+            if on_done:
+                on_done(ticker, error)
+    frames = {t: results[t] for t in tickers if t in results}
+    failures = {t: errors[t] for t in tickers if t in errors}
+    return frames, failures
+
+
+def flatten_columns(df):
+    """Collapse yfinance (Price, Ticker) columns into plain names like "Close"."""
+    if not isinstance(df.columns, pd.MultiIndex):
+        return df
+    df = df.copy()
+    # The "Date" column of a reset table has an empty ticker level
+    tickers = {t for t in df.columns.get_level_values(-1) if t}
+    if df.columns.nlevels == 2 and len(tickers) <= 1:
+        df.columns = df.columns.get_level_values(0)
+    else:
+        df.columns = ["_".join(str(p) for p in col if p) for col in df.columns]
+    return df
+
+
+def to_table(df, ticker=None):
+    """Return a copy of ``df`` with the date index as a regular "Date" column.
+
+    When ``ticker`` is given it is prepended as a "Ticker" column.
+    """
+    df = df.copy()
+    df.index.name = "Date"
+    df.reset_index(inplace=True)
+    if ticker is not None:
+        df.insert(0, "Ticker", ticker)
+    return df
+
+
+class TableWriter:
+    """Serialize tables to a text stream in fixed-size row chunks.
+
+    Only one chunk is rendered to text at a time, so memory stays flat for
+    long histories and readers of a pipe see the first rows right away.
+    ``json`` emits a single array built incrementally, ``ndjson`` one record
+    per line. Several tables can be written in sequence; later ones are
+    aligned to the columns of the first.
+    """
+
+    def __init__(self, stream, fmt, chunk_rows=CHUNK_ROWS, timer=None):
+        self.stream = stream
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.timer = timer or PhaseTimer(enabled=False)
+        self.columns = None
+        self.rows = 0
+
+    def render(self, chunk):
+        """Return one chunk of rows as text in the writer's format."""
+        if self.fmt == "csv":
+            return chunk.to_csv(None, index=False, header=self.rows == 0, lineterminator="\n")
+        if self.fmt == "ndjson":
+            text = chunk.to_json(orient="records", date_format="iso", lines=True)
+            return text if text.endswith("\n") else text + "\n"
+        # Strip the brackets so consecutive chunks join into one array
+        text = chunk.to_json(orient="records", date_format="iso")[1:-1]
+        return ("," if self.rows else "") + text
+
+    def write(self, df):
+        if self.columns is None:
+            self.columns = df.columns
+            if self.fmt == "json":
+                self.stream.write("[")
+        else:
+            df = df.reindex(columns=self.columns)
+        for lo in range(0, len(df), self.chunk_rows):
+            chunk = df.iloc[lo:lo + self.chunk_rows]
+            with self.timer.phase("serialize"):
+                text = self.render(chunk)
+            with self.timer.phase("write"):
+                self.stream.write(text)
+                self.stream.flush()
+            self.rows += len(chunk)
+
+    def close(self):
+        if self.fmt == "json":
+            self.stream.write(("[" if self.columns is None else "") + "]\n")
+        self.stream.flush()
+
+
+def to_columnar(df):
+    """Flatten column names and give every column a concrete dtype."""
+    df = flatten_columns(df)
+    df = df.rename(columns=str).rename_axis(columns=None)
+    if "Volume" in df:
+        df = df.assign(Volume=df["Volume"].fillna(0).astype("int64"))
+    return df
+
+
+def to_records(df):
+    """Convert a table to a NumPy structured array (one field per column).
+
+    Timezone-aware dates are stored as naive UTC ``datetime64`` and text
+    columns as fixed-width unicode so the result can be memory-mapped.
+    """
+    fields = {}
+    for name in df.columns:
+        col = df[name]
+        if isinstance(col.dtype, pd.DatetimeTZDtype):
+            col = col.dt.tz_convert("UTC").dt.tz_localize(None)
+        values = col.to_numpy()
+        if values.dtype == object:
+            values = values.astype(str)
+        fields[name] = values
+    records = np.empty(len(df), dtype=[(name, v.dtype) for name, v in fields.items()])
+    for name, values in fields.items():
+        records[name] = values
+    return records
+
+
+def write_binary(frames, output, fmt, timer=None):
+    """Write tables as a single Parquet, Feather or ``.npy`` file."""
+    if output == "-":
+        raise click.UsageError(f"--format {fmt} is binary; pass --output FILE or --output-dir.")
+    timer = timer or PhaseTimer(enabled=False)
+    frames = list(frames)
+    with timer.phase("serialize"):
+        df = pd.concat([to_columnar(f) for f in frames], ignore_index=True)
+        records = to_records(df) if fmt == "npy" else None
+    try:
+        # Parquet and Feather encode while writing, so all of it counts as write
+        with timer.phase("write"):
+            if fmt == "npy":
+                # Pass a file object so NumPy does not append its own extension
+                with open(output, "wb") as f:
+                    np.save(f, records, allow_pickle=False)
+            elif fmt == "parquet":
+                df.to_parquet(output, index=False)
+            else:
+                df.to_feather(output)
+    except ImportError:
+        raise click.ClickException(f"--format {fmt} requires the 'pyarrow' package. Install it with: pip install pyarrow")
+    except OSError as e:
+        raise click.ClickException(f"Failed to write output: {e}")
+    click.secho(f"Saved to {output}", fg="green", err=True)
+
+
+def load_bars(path, raw=False):
+    """Load bars written with ``--format parquet``, ``feather`` or ``npy``.
+
+    ``.npy`` files are memory-mapped rather than read; with ``raw=True`` the
+    mapped record array is returned as is, so only the pages actually
+    touched are loaded from disk.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".npy":
+        records = np.load(path, mmap_mode="r", allow_pickle=False)
+        if raw:
+            return records
+        return pd.DataFrame({name: records[name] for name in records.dtype.names})
+    if suffix == ".parquet":
+        return pd.read_parquet(path)
+    if suffix == ".feather":
+        return pd.read_feather(path)
+    raise ValueError(f"Unsupported bar file (expected .parquet, .feather or .npy): {path}")
+
+
+def read_bars_file(path):
+    """Load bars saved by this tool (or shaped like them) indexed by date.
+
+    Reads csv, json and ndjson tables as well as the binary formats of
+    ``load_bars``. JSON records whose keys are stringified (Price, Ticker)
+    tuples, as in ``msft_2023.json``, get their MultiIndex columns back.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in (".parquet", ".feather", ".npy"):
+        df = load_bars(path)
+    elif suffix == ".csv":
+        with open(path, encoding="utf-8") as fh:
+            fh.readline()
+            second = fh.readline()
+        # A single-ticker table keeps a second header row with the ticker
+        if second.startswith(","):
+            df = pd.read_csv(path, header=[0, 1])
+            df.columns = pd.MultiIndex.from_tuples(
+                [(p, "" if t.startswith("Unnamed:") else t) for p, t in df.columns], names=["Price", "Ticker"]
+            )
+        else:
+            df = pd.read_csv(path)
+    elif suffix in (".json", ".ndjson", ".jsonl"):
+        df = pd.read_json(path, lines=suffix != ".json", orient="records", convert_dates=False)
+    else:
+        raise ValueError(f"Unsupported bar file: {path}")
+
+    if all(isinstance(c, str) and c.startswith("(") for c in df.columns):
+        df.columns = pd.MultiIndex.from_tuples(
+            [ast.literal_eval(c) for c in df.columns], names=["Price", "Ticker"]
+        )
+    date_col = next((c for c in df.columns if _field(c) in ("Date", "Datetime")), None)
+    if date_col is None:
+        raise ValueError(f"No Date column in {path}")
+    index = pd.DatetimeIndex(pd.to_datetime(df[date_col], format="ISO8601"), name="Date")
+    return df.drop(columns=[date_col]).set_index(index)
+
+
+def file_tickers(df):
+    """Tickers named in a "Ticker" column or the ticker level of the columns."""
+    if isinstance(df.columns, pd.MultiIndex):
+        names = df.columns.get_level_values(-1)
+    elif "Ticker" in df.columns:
+        names = df["Ticker"].dropna()
+    else:
+        return []
+    return list(dict.fromkeys(str(t).upper() for t in names if t))
+
+
+def select_ticker(df, ticker=None):
+    """Narrow bars to one ticker; returns (bars, ticker named in the data or None).
+
+    Combined tables keep each ticker's rows under a "Ticker" column and
+    yfinance downloads keep its columns under a ticker level. When the data
+    holds several tickers, ``ticker`` must be one of them; a single-ticker
+    file is returned as is.
+    """
+    names = file_tickers(df)
+    if not names:
+        return df, None
+    if ticker is not None:
+        ticker = ticker.upper()
+    if len(names) == 1 and ticker in (None, names[0]):
+        chosen = names[0]
+    elif len(names) == 1:
+        return df, None
+    elif ticker is None:
+        raise ValueError(f"it holds several tickers ({', '.join(names)}); pass one as TICKER")
+    elif ticker not in names:
+        raise ValueError(f"no bars for {ticker}; it holds {', '.join(names)}")
+    else:
+        chosen = ticker
+    if isinstance(df.columns, pd.MultiIndex):
+        keep = [str(t).upper() == chosen for t in df.columns.get_level_values(-1)]
+        return df.loc[:, keep], chosen
+    rows = df["Ticker"].astype(str).str.upper() == chosen
+    return df.loc[rows].drop(columns="Ticker"), chosen
+
+
+def write_output(frames, output, fmt, timer=None):
+    """Stream one or more tables to ``output`` ('-' for stdout)."""
+    if fmt in BINARY_FORMATS:
+        return write_binary(frames, output, fmt, timer)
+    to_stdout = output == "-"
+    try:
+        stream = sys.stdout if to_stdout else open(output, "w", encoding="utf-8", newline="")
+    except OSError as e:
+        raise click.ClickException(f"Failed to write output: {e}")
+    from bulk_output import silence_broken_pipe
+
+    try:
+        # A closed pipe (`| head`) ends the run quietly with status 1
+        with silence_broken_pipe():
+            writer = TableWriter(stream, fmt, timer=timer)
+            for df in frames:
+                writer.write(df)
+            writer.close()
+    except OSError as e:
+        raise click.ClickException(f"Failed to write output: {e}")
+    except Exception as e:
+        raise click.ClickException(f"Failed to serialize data: {e}")
+    finally:
+        if not to_stdout:
+            stream.close()
+    if not to_stdout:
+        click.secho(f"Saved to {output}", fg="green", err=True)
+
+
 @click.command()
-@click.argument("ticker")
+@click.argument("tickers", nargs=-1)
+@click.option(
+    "--tickers-file",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    help="Read additional tickers from a file ('-' for stdin), one per line or comma separated."
+)
 @click.option(
     "--start",
     type=click.DateTime(formats=["%Y-%m-%d"]),
@@ -44,13 +893,19 @@ def function(arg1, arg2, arg3, keyword=True):
     show_default=True,
     help="Output file path, or '-' for stdout."
 )
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Write one <TICKER>.<format> file per ticker into this directory instead of a combined output."
+)
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["csv","json"]),
+    type=click.Choice(["csv","json","ndjson","parquet","feather","npy"]),
     default="csv",
     show_default=True,
-    help="Output format."
+    help="Output format (ndjson writes one JSON record per line; parquet, feather "
+         "and npy write flat, typed columns and need --output or --output-dir)."
 )
 @click.option(
     "--adjust/--no-adjust",
@@ -58,10 +913,129 @@ def function(arg1, arg2, arg3, keyword=True):
     show_default=True,
     help="Whether to auto-adjust OHLC for splits/dividends."
 )
-def main(ticker, start, end, period, interval, output, fmt, adjust):
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    show_default=True,
+    help="Reuse previously downloaded bars and fetch only missing dates."
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=DEFAULT_CACHE_DIR,
+    show_default=True,
+    help="Directory for the price cache (or set TESTER_CACHE_DIR)."
+)
+@click.option(
+    "--cache-ttl",
+    type=click.FloatRange(min=0),
+    help="Evict cache entries not used for this many days."
+)
+@click.option(
+    "--cache-max-mb",
+    type=click.FloatRange(min=0),
+    help="Evict least recently used entries beyond this total size."
+)
+@click.option(
+    "--resample/--no-resample",
+    "local_resample",
+    default=True,
+    show_default=True,
+    help="Serve " + "/".join(LOCAL_INTERVALS) + " bars by resampling cached daily bars "
+         "instead of downloading them separately."
+)
+@click.option(
+    "--from-file",
+    "bars_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Read bars from a local csv/json/ndjson/parquet/feather/npy file (e.g. one "
+         "written by this tool) instead of downloading; --interval resamples them to a "
+         "coarser interval and --start/--end/--period select the dates. A file holding "
+         "several tickers needs one of them as TICKER."
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Maximum number of concurrent downloads."
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=2,
+    show_default=True,
+    help="Retries per ticker after a failed or empty download."
+)
+@click.option(
+    "--backoff",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    help="Initial retry delay in seconds, doubled after each attempt."
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    help="Print running return/volatility/drawdown statistics to stderr "
+         "(kept incrementally over the whole cached history)."
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    help="Print the time spent parsing, fetching, computing, serializing and writing to stderr."
+)
+@click.option(
+    "--profile",
+    type=click.Choice(["cpu", "mem", "all"]),
+    help="Report hot functions (cpu), peak allocation sites (mem) or both for the run "
+         "(downloads in worker threads appear as the wait for them)."
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False),
+    help="Write the profile report here instead of stderr (.prof: raw cProfile data)."
+)
+@click.pass_context
+def main(ctx, tickers, tickers_file, start, end, period, interval, output, output_dir, fmt, adjust,
+         cache, cache_dir, cache_ttl, cache_max_mb, local_resample, bars_file, workers, retries,
+         backoff, show_stats, timings, profile, profile_output):
     """
-    Download historical data for TICKER from Yahoo Finance and save to a file (or stdout).
+    Download historical data for one or more TICKERS from Yahoo Finance and save to a file (or stdout).
+
+    With several tickers the downloads run concurrently and the result is
+    either one combined table with a "Ticker" column or, with --output-dir,
+    one file per ticker. A failing ticker is reported and skipped.
+
+    With --from-file the bars come from a local file instead, e.g.
+    `tester.py --from-file msft_2023.json --interval 1wk --start 2023-06-01`.
     """
+    # Fail before any download or file parsing rather than after it
+    if fmt in BINARY_FORMATS and output == "-" and not output_dir:
+        raise click.UsageError(f"--format {fmt} is binary; pass --output FILE or --output-dir.")
+    timer = PhaseTimer(enabled=timings, started=_INVOKED)
+    # Report on close so failed runs still show where the time went
+    ctx.call_on_close(timer.report)
+    if profile:
+        from cli_profiling import profiled
+
+        ctx.with_resource(profiled(profile, profile_output))
+
+    # Run as a script, parsing starts before click reads argv
+    parse_started = _INVOKED or time.perf_counter()
+    tickers = list(tickers)
+    if tickers_file:
+        tickers.extend(read_tickers(tickers_file))
+    # Drop duplicates but keep the order given by the user
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    if bars_file:
+        timer.add("parse", time.perf_counter() - parse_started)
+        return serve_file(ctx, bars_file, tickers, start, end, period, interval, output, output_dir,
+                          fmt, show_stats, timer)
+    if not tickers:
+        raise click.UsageError("Provide at least one TICKER or --tickers-file.")
+
     # Validate mutually exclusive options
     if (start or end) and period:
         # If any date is provided, ignore period to avoid confusion
@@ -71,10 +1045,35 @@ def main(ticker, start, end, period, interval, output, fmt, adjust):
     start_str = start.date().isoformat() if start else None
     end_str = end.date().isoformat() if end else None
 
-    # Fetch data
-    click.echo(f"Downloading {ticker} (interval={interval})...", err=True)
-    try:
-        df = yf.download(
+    # Resolve the request to a date range so it can be served from the cache
+    if period:
+        date_range = period_to_range(period)
+    else:
+        date_range = (
+            start.date() if start else date(1970, 1, 1),
+            end.date() if end else date.today() + timedelta(days=1),
+        )
+
+    store = None
+    if cache and date_range is not None:
+        store = PriceCache(
+            cache_dir,
+            ttl=cache_ttl * 86400 if cache_ttl is not None else None,
+            max_bytes=cache_max_mb * 1024 * 1024 if cache_max_mb is not None else None,
+        )
+    timer.add("parse", time.perf_counter() - parse_started)
+
+    # Coarse bars are aggregated from the cached daily ones, so they share
+    # one entry and never need a download of their own
+    fetch_interval = "1d" if store is not None and local_resample and interval in LOCAL_INTERVALS else interval
+
+    def fetch(ticker):
+        if store is not None and fetch_interval != interval:
+            daily = store.get(ticker, *date_range, interval=fetch_interval, adjust=adjust)
+            return BarStore(daily, fetch_interval).resample(interval).frame if not daily.empty else daily
+        if store is not None:
+            return store.get(ticker, *date_range, interval=interval, adjust=adjust)
+        return yf.download(
             tickers=ticker,
             start=start_str,
             end=end_str,
@@ -84,37 +1083,120 @@ def main(ticker, start, end, period, interval, output, fmt, adjust):
             progress=False,
             threads=False,
         )
-    except Exception as e:
-        raise click.ClickException(f"Failed to download data: {e}")
 
-    if df is None or df.empty:
-        raise click.ClickException("No data returned. Check the ticker, dates, or interval.")
+    # Fetch data
+    if len(tickers) == 1:
+        click.echo(f"Downloading {tickers[0]} (interval={interval})...", err=True)
+    else:
+        click.echo(f"Downloading {len(tickers)} tickers (interval={interval}, workers={workers})...", err=True)
 
-    # Ensure a clean tabular output (include the date as a column)
-    df = df.copy()
-    df.index.name = "Date"
-    df.reset_index(inplace=True)
+    def report(ticker, error):
+        if error is not None:
+            click.secho(f"{ticker}: {error}", fg="red", err=True)
+        else:
+            click.echo(f"{ticker}: ok", err=True)
+
+    with timer.phase("fetch"):
+        frames, failures = download_many(
+            tickers, fetch, workers, retries, backoff, on_done=report if len(tickers) > 1 else None
+        )
 
-    # Serialize
+    if len(tickers) == 1 and failures:
+        error = failures[tickers[0]]
+        if isinstance(error, ValueError):
+            raise click.ClickException(str(error))
+        raise click.ClickException(f"Failed to download data: {error}")
+    if not frames:
+        raise click.ClickException("No data returned for any ticker.")
+
+    if show_stats:
+        for ticker, df in frames.items():
+            with timer.phase("compute"):
+                stats = store.stats(ticker, fetch_interval, adjust) if store is not None else None
+                if stats is None:
+                    stats = RunningStats().update(close_series(df))
+                    stats_interval = interval
+                else:
+                    stats_interval = fetch_interval
+            echo_stats(ticker, stats, stats_interval)
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        for ticker, df in frames.items():
+            with timer.phase("compute"):
+                table = to_table(df)
+            write_output([table], os.path.join(output_dir, f"{ticker}.{fmt}"), fmt, timer)
+    elif len(tickers) == 1:
+        with timer.phase("compute"):
+            table = to_table(frames[tickers[0]])
+        write_output([table], output, fmt, timer)
+    else:
+        # Stream ticker by ticker rather than concatenating everything first
+        write_output(
+            timer.timed("compute", (to_table(flatten_columns(df), ticker) for ticker, df in frames.items())),
+            output,
+            fmt,
+            timer,
+        )
+
+    if failures:
+        raise click.ClickException(f"{len(failures)} of {len(tickers)} tickers failed: {', '.join(failures)}")
+
+
+def echo_stats(ticker, stats, interval="1d"):
+    """Print a one-line RunningStats summary to stderr (nothing without returns)."""
+    if stats.count == 0:
+        return
+    ann_ret, ann_vol = stats.annualized(PERIODS_PER_YEAR.get(interval, 252))
+    click.echo(
+        f"{ticker} {stats.first_ts[:10]}..{stats.last_ts[:10]}: "
+        f"returns={stats.count} ann_return={ann_ret:.2%} "
+        f"ann_volatility={ann_vol:.2%} max_drawdown={stats.max_drawdown:.2%}",
+        err=True,
+    )
+
+
+def serve_file(ctx, bars_file, tickers, start, end, period, interval, output, output_dir, fmt, show_stats,
+               timer=None):
+    """Answer a request from bars in a local file: resample, slice, write."""
+    timer = timer or PhaseTimer(enabled=False)
     try:
-        if fmt == "csv":
-            payload = df.to_csv(index=False)
-        else:
-            payload = df.to_json(orient="records", date_format="iso")
-    except Exception as e:
-        raise click.ClickException(f"Failed to serialize data: {e}")
+        with timer.phase("fetch"):
+            df, in_file = select_ticker(read_bars_file(bars_file), tickers[0] if tickers else None)
+            bars = BarStore(df, infer_interval(df.index))
+    except (OSError, ValueError) as e:
+        raise click.ClickException(f"Failed to read {bars_file}: {e}")
+    ticker = (tickers[0] if tickers else in_file or Path(bars_file).stem).upper()
 
-    # Write to file or stdout
-    if output == "-":
-        # Use click.echo for proper stdout handling (no color)
-        click.echo(payload, nl=True)
+    # The default --period would cut a historical file down to nothing, so
+    # only an explicit one applies
+    if ctx.get_parameter_source("interval") is not click.core.ParameterSource.COMMANDLINE:
+        interval = bars.interval
+    if start or end:
+        lo, hi = start, end
+    elif period and ctx.get_parameter_source("period") is click.core.ParameterSource.COMMANDLINE:
+        lo, hi = period_to_range(period) or (None, None)
     else:
-        try:
-            with open(output, "w", encoding="utf-8") as f:
-                f.write(payload)
-            click.secho(f"Saved to {output}", fg="green", err=True)
-        except Exception as e:
-            raise click.ClickException(f"Failed to write output: {e}")
+        lo = hi = None
+    try:
+        with timer.phase("compute"):
+            df = bars.query(lo, hi, interval)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    if df.empty:
+        raise click.ClickException(f"No bars in {bars_file} for the requested dates.")
+    click.echo(f"Read {len(df)} {interval} bars of {ticker} from {bars_file}", err=True)
+
+    with timer.phase("compute"):
+        stats = RunningStats().update(close_series(df)) if show_stats else None
+        table = to_table(df)
+    if stats is not None:
+        echo_stats(ticker, stats, interval)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        output = os.path.join(output_dir, f"{ticker}.{fmt}")
+    write_output([table], output, fmt, timer)
 
 if __name__ == "__main__":
+    _INVOKED = time.perf_counter()
     main()